@@ -10,8 +10,29 @@ import asyncio
 import json
 import re
 import httpx
+import logging
+import logging.handlers
+import queue
 from dotenv import load_dotenv
 
+# Service modules (services.*, utils.*) log at INFO alongside print() output; the root
+# logger stays at WARNING so third-party INFO logs (e.g. httpx request URLs, which can
+# carry secrets in query strings) are not emitted. Records go through a queue to a
+# background thread so writing to stderr never blocks the event loop.
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# The queue handler only merges args into the message; the level is added on output
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.WARNING, handlers=[_log_queue_handler])
+for _app_logger in ("services", "utils"):
+    logging.getLogger(_app_logger).setLevel(logging.INFO)
+for _http_logger in ("httpx", "httpcore"):
+    logging.getLogger(_http_logger).setLevel(logging.WARNING)
+_log_listener.start()
+
 from services.instagram_api import InstagramAPIService
 from services.openai_service import OpenAIService
 from services.linkedin_api import LinkedInAPIService
@@ -35,6 +56,7 @@ from utils.post_memory_helper import save_post_to_memory, is_first_post, get_pos
 from utils.hyperspell_helper import get_memory_context
 from utils.veo_helper import wait_for_video_completion_with_extensions
 from utils.user_id_helper import normalize_user_id, get_user_id_from_request
+from utils import fast_json
 from services.web_research_service import WebResearchService
 from services.seo_aeo_service import SEOAEOService
 from models.schemas import (
@@ -339,6 +361,23 @@ web_research_service = WebResearchService(openai_service=openai_service if opena
 oauth_states = {}
 
 
+@app.on_event("startup")
+async def warm_up_services():
+    """Start opening the Mem0 vector store in the background so startup is not delayed"""
+    app.state.memory_warmup = asyncio.create_task(memory_service.aensure_ready())
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close pooled HTTP clients and worker threads held by long-lived services"""
+    await linkedin_scraper.aclose()
+    await notion_service.aclose()
+    await oauth_service.aclose()
+    memory_service.mem0_service.close()
+    # Flush any queued log records
+    _log_listener.stop()
+
+
 @app.get("/")
 async def root():
     return {
@@ -2498,9 +2537,10 @@ async def list_google_drive_files(
 async def list_jira_issues(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-    jql: Optional[str] = None
+    jql: Optional[str] = None,
+    max_results: int = 100
 ):
-    """List issues from user's Jira workspace"""
+    """List issues from user's Jira workspace (at most max_results, capped by the service)"""
     connection = db.query(IntegrationConnection).filter(
         IntegrationConnection.user_id == current_user.id,
         IntegrationConnection.platform == "jira",
@@ -2527,7 +2567,7 @@ async def list_jira_issues(
                 connection.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
                 db.commit()
     
-    issues = await jira_service.search_issues(access_token, cloud_id, jql or "")
+    issues = await jira_service.search_issues(access_token, cloud_id, jql or "", max_results=max_results)
     
     return [
         JiraIssueResponse(
@@ -2649,10 +2689,15 @@ async def import_content(
         if platform == "notion":
             # Use connection token if available, otherwise use internal token
             access_token = connection.access_token if connection else None
+            # Re-importing a page should pick up edits made in Notion since the last fetch
+            for page_id in request.item_ids:
+                notion_service.invalidate(page_id, access_token)
+            # Fetch every page's content up front, a few requests at a time
+            page_contents = await notion_service.get_pages_content(access_token, request.item_ids)
             for page_id in request.item_ids:
                 try:
                     # Get page content
-                    raw_content = await notion_service.get_page_content(access_token, page_id)
+                    raw_content = page_contents.get(page_id)
                     if not raw_content:
                         errors.append({"id": page_id, "error": "Failed to fetch content"})
                         continue
@@ -5146,6 +5191,7 @@ async def scrape_and_score_linkedin_posts(
         if memory_service.is_available():
             user_id = current_user.email if current_user else "anonymous_user"
             
+            post_memories = []
             for post in posts:
                 try:
                     # Format post data for Hyperspell
@@ -5172,19 +5218,21 @@ Posted At: {post.get('posted_at', 'N/A')}
 Scraped At: {post.get('scraped_at', datetime.now().isoformat())}
 
 Full Data:
-{json.dumps(post, indent=2)}
+{fast_json.dumps(post, indent=True).decode()}
 """
                     
-                    result = await memory_service.add_text_memory(
-                        user_id=user_id,
-                        text=post_memory,
-                        collection="linkedin_scored_posts"
-                    )
-                    
-                    if result:
-                        saved_count += 1
+                    post_memories.append(post_memory)
                 except Exception as e:
-                    print(f"[API] ⚠️ Failed to save post {post.get('post_id')}: {e}")
+                    print(f"[API] ⚠️ Failed to format post {post.get('post_id')}: {e}")
+            
+            # Write all posts concurrently instead of one round trip after another
+            result = await memory_service.add_text_memories(
+                user_id=user_id,
+                texts=post_memories,
+                collection="linkedin_scored_posts"
+            )
+            if result:
+                saved_count = result['count']
         
         print(f"[API] ✓ Scraped {len(posts)} posts, saved {saved_count} to Hyperspell")
         
@@ -4,14 +4,28 @@ Allows users to import issues and content from Jira as brand context
 """
 
 import os
+import logging
 import httpx
 from typing import Dict, Optional, List
 import base64
+from urllib.parse import urlencode
+
+from utils import fast_json
+from utils.ttl_cache import TTLCache, hash_token
+
+logger = logging.getLogger(__name__)
 
 
 class JiraService:
     """Service for interacting with Jira API"""
     
+    # Issues per /search/jql page (Jira returns at most 100 when fields are requested)
+    SEARCH_PAGE_SIZE = 100
+    # Upper bound on the issues one search_issues call returns, whatever the caller asks for
+    MAX_SEARCH_RESULTS = 1000
+    # /search/jql rejects unbounded JQL, so the default "recent issues" query is limited to a year
+    DEFAULT_SEARCH_JQL = "updated >= -365d ORDER BY updated DESC"
+    
     def __init__(self):
         self.api_base_url = "https://api.atlassian.com"
         self.oauth_base_url = "https://auth.atlassian.com"
@@ -27,73 +41,79 @@ class JiraService:
             "read:jira-user",
             "offline_access"
         ]
+        # Parts of the authorization URL that never change between calls
+        self._scope_str = " ".join(self.scopes)
+        self._auth_url_prefix = f"{self.oauth_base_url}/authorize?"
+        
+        # Accessible resources and user info are stable for the lifetime of a token
+        self._token_cache = TTLCache(maxsize=1024, ttl=300)
         
         if self.client_id and self.client_secret:
-            print("[Jira] Service initialized with OAuth credentials")
+            logger.info("[Jira] Service initialized with OAuth credentials")
         else:
-            print("[Jira] WARNING: Jira OAuth not configured. Set JIRA_CLIENT_ID and JIRA_CLIENT_SECRET")
+            logger.warning("[Jira] Jira OAuth not configured. Set JIRA_CLIENT_ID and JIRA_CLIENT_SECRET")
     
     def get_authorization_url(self, state: str) -> str:
         """Get Jira OAuth authorization URL"""
-        from urllib.parse import urlencode
         params = {
             "audience": "api.atlassian.com",
             "client_id": self.client_id,
-            "scope": " ".join(self.scopes),
+            "scope": self._scope_str,
             "redirect_uri": self.redirect_uri,
             "state": state,
             "response_type": "code",
             "prompt": "consent"
         }
-        return f"{self.oauth_base_url}/authorize?{urlencode(params)}"
+        return self._auth_url_prefix + urlencode(params)
+    
+    async def _request_token(self, data: Dict) -> bytes:
+        """POST to the token endpoint and return the raw JSON body"""
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{self.oauth_base_url}/oauth/token",
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    **data
+                },
+                headers={
+                    "Content-Type": "application/x-www-form-urlencoded"
+                }
+            )
+            response.raise_for_status()
+            return response.content
     
     async def exchange_code_for_token(self, code: str) -> Optional[Dict]:
         """Exchange authorization code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.oauth_base_url}/oauth/token",
-                    data={
-                        "grant_type": "authorization_code",
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "code": code,
-                        "redirect_uri": self.redirect_uri
-                    },
-                    headers={
-                        "Content-Type": "application/x-www-form-urlencoded"
-                    }
-                )
-                response.raise_for_status()
-                return response.json()
-        except Exception as e:
-            print(f"[Jira] Error exchanging code: {e}")
+            raw = await self._request_token({
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": self.redirect_uri
+            })
+            return fast_json.loads(raw)
+        except (httpx.HTTPError, ValueError) as e:
+            self._log_request_error("exchanging code", e)
             return None
     
     async def refresh_access_token(self, refresh_token: str) -> Optional[Dict]:
         """Refresh access token using refresh token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.oauth_base_url}/oauth/token",
-                    data={
-                        "grant_type": "refresh_token",
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "refresh_token": refresh_token
-                    },
-                    headers={
-                        "Content-Type": "application/x-www-form-urlencoded"
-                    }
-                )
-                response.raise_for_status()
-                return response.json()
-        except Exception as e:
-            print(f"[Jira] Error refreshing token: {e}")
+            raw = await self._request_token({
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token
+            })
+            return fast_json.loads(raw)
+        except (httpx.HTTPError, ValueError) as e:
+            self._log_request_error("refreshing token", e)
             return None
     
     async def get_accessible_resources(self, access_token: str) -> List[Dict]:
-        """Get list of accessible Jira sites/cloud IDs"""
+        """Get list of accessible Jira sites/cloud IDs (cached per access token)"""
+        cache_key = ("resources", hash_token(access_token))
+        cached = self._token_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(
@@ -104,13 +124,24 @@ class JiraService:
                     }
                 )
                 response.raise_for_status()
-                return response.json()
-        except Exception as e:
-            print(f"[Jira] Error getting accessible resources: {e}")
+                resources = response.json()
+                self._token_cache.set(cache_key, resources)
+                return resources
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                self.invalidate_token_cache(access_token)
+            self._log_request_error("getting accessible resources", e)
+            return []
+        except (httpx.TransportError, ValueError) as e:
+            self._log_request_error("getting accessible resources", e)
             return []
     
     async def get_user_info(self, access_token: str, cloud_id: str) -> Optional[Dict]:
-        """Get authenticated user information"""
+        """Get authenticated user information (cached per access token and site)"""
+        cache_key = ("user", hash_token(access_token), cloud_id)
+        cached = self._token_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(
@@ -121,39 +152,71 @@ class JiraService:
                     }
                 )
                 response.raise_for_status()
-                return response.json()
-        except Exception as e:
-            print(f"[Jira] Error getting user info: {e}")
+                user_info = response.json()
+                self._token_cache.set(cache_key, user_info)
+                return user_info
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                self.invalidate_token_cache(access_token, cloud_id)
+            self._log_request_error("getting user info", e)
+            return None
+        except (httpx.TransportError, ValueError) as e:
+            self._log_request_error("getting user info", e)
             return None
     
-    async def search_issues(self, access_token: str, cloud_id: str, jql: str = "", max_results: int = 100) -> List[Dict]:
-        """Search for issues in Jira using JQL"""
+    def invalidate_token_cache(self, access_token: str, cloud_id: Optional[str] = None):
+        """Drop cached lookups for an access token (e.g. after it was rejected)"""
+        token_hash = hash_token(access_token)
+        self._token_cache.pop(("resources", token_hash))
+        if cloud_id:
+            self._token_cache.pop(("user", token_hash, cloud_id))
+    
+    async def search_issues(
+        self,
+        access_token: str,
+        cloud_id: str,
+        jql: str = "",
+        max_results: int = 100
+    ) -> List[Dict]:
+        """Search for issues in Jira using JQL, returning at most max_results issues.
+
+        Uses /rest/api/3/search/jql, which pages with nextPageToken/isLast instead of
+        startAt/total, so the pages are fetched one after another until the cap is reached.
+        max_results is clamped to MAX_SEARCH_RESULTS.
+        """
+        max_results = max(0, min(max_results, self.MAX_SEARCH_RESULTS))
         try:
             params = {
-                "maxResults": max_results,
-                "fields": "summary,description,status,assignee,reporter,created,updated,project,issuetype,priority"
+                "fields": "summary,description,status,assignee,reporter,created,updated,project,issuetype,priority",
+                "jql": jql or self.DEFAULT_SEARCH_JQL
+            }
+            url = f"{self.api_base_url}/ex/jira/{cloud_id}/rest/api/3/search/jql"
+            headers = {
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json"
             }
             
-            if jql:
-                params["jql"] = jql
-            else:
-                # Default: get recent issues
-                params["jql"] = "ORDER BY updated DESC"
-            
+            issues: List[Dict] = []
+            pages = 0
             async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_base_url}/ex/jira/{cloud_id}/rest/api/3/search",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Accept": "application/json"
-                    },
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("issues", [])
-        except Exception as e:
-            print(f"[Jira] Error searching issues: {e}")
+                while len(issues) < max_results:
+                    params["maxResults"] = min(self.SEARCH_PAGE_SIZE, max_results - len(issues))
+                    response = await client.get(url, headers=headers, params=params)
+                    response.raise_for_status()
+                    data = response.json()
+                    pages += 1
+                    issues.extend(data.get("issues") or [])
+                    
+                    next_page_token = data.get("nextPageToken")
+                    if data.get("isLast", True) or not next_page_token or not data.get("issues"):
+                        break
+                    params["nextPageToken"] = next_page_token
+            
+            if pages > 1:
+                logger.info("[Jira] Fetched %d issues across %d pages", len(issues), pages)
+            return issues[:max_results]
+        except (httpx.HTTPError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._log_request_error("searching issues", e)
             return []
     
     async def get_issue_content(self, access_token: str, cloud_id: str, issue_key: str) -> Optional[str]:
@@ -174,7 +237,7 @@ class JiraService:
                 issue = response.json()
                 
                 # Extract fields
-                fields = issue.get("fields", {})
+                fields = issue.get("fields") or {}
                 
                 # Build content string
                 content_parts = []
@@ -185,61 +248,73 @@ class JiraService:
                     content_parts.append(f"# {summary}")
                 
                 # Description (may be in ADF format)
-                description = fields.get("description", {})
+                description = fields.get("description")
                 if description:
                     description_text = self._extract_adf_text(description)
                     if description_text:
                         content_parts.append(f"\n## Description\n{description_text}")
                 
                 # Status
-                status = fields.get("status", {})
+                status = fields.get("status")
                 if status:
                     content_parts.append(f"\n## Status\n{status.get('name', 'Unknown')}")
                 
                 # Project
-                project = fields.get("project", {})
+                project = fields.get("project")
                 if project:
                     content_parts.append(f"\n## Project\n{project.get('name', 'Unknown')}")
                 
                 # Issue Type
-                issuetype = fields.get("issuetype", {})
+                issuetype = fields.get("issuetype")
                 if issuetype:
                     content_parts.append(f"\n## Issue Type\n{issuetype.get('name', 'Unknown')}")
                 
                 # Priority
-                priority = fields.get("priority", {})
+                priority = fields.get("priority")
                 if priority:
                     content_parts.append(f"\n## Priority\n{priority.get('name', 'Unknown')}")
                 
                 # Assignee
-                assignee = fields.get("assignee", {})
+                assignee = fields.get("assignee")
                 if assignee:
                     content_parts.append(f"\n## Assignee\n{assignee.get('displayName', 'Unassigned')}")
                 
                 # Reporter
-                reporter = fields.get("reporter", {})
+                reporter = fields.get("reporter")
                 if reporter:
                     content_parts.append(f"\n## Reporter\n{reporter.get('displayName', 'Unknown')}")
                 
                 # Comments
-                comment = fields.get("comment", {})
+                comment = fields.get("comment")
                 if comment:
-                    comments = comment.get("comments", [])
+                    comments = comment.get("comments") or []
                     if comments:
                         content_parts.append(f"\n## Comments")
                         for cmt in comments:
-                            author = cmt.get("author", {}).get("displayName", "Unknown")
-                            body = cmt.get("body", {})
+                            author = (cmt.get("author") or {}).get("displayName", "Unknown")
+                            body = cmt.get("body")
                             body_text = self._extract_adf_text(body)
-                            created = cmt.get("created", "")
+                            created = cmt.get("created") or ""
                             if body_text:
                                 content_parts.append(f"\n### {author} ({created})\n{body_text}")
                 
                 return "\n".join(content_parts) if content_parts else None
-        except Exception as e:
-            print(f"[Jira] Error getting issue content: {e}")
+        except (httpx.HTTPError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._log_request_error("getting issue content", e)
             return None
     
+    def _log_request_error(self, action: str, error: Exception):
+        """Log a failed Jira call, keeping HTTP status errors distinguishable from transport failures"""
+        if isinstance(error, httpx.HTTPStatusError):
+            logger.warning(
+                "[Jira] Error %s: HTTP %s", action, error.response.status_code,
+                extra={"url": str(error.request.url), "status_code": error.response.status_code}
+            )
+        elif isinstance(error, httpx.TransportError):
+            logger.warning("[Jira] Error %s: %s: %s", action, type(error).__name__, error)
+        else:
+            logger.exception("[Jira] Error %s", action)
+    
     def _extract_adf_text(self, adf_node: Dict) -> str:
         """Extract plain text from Atlassian Document Format (ADF)"""
         if not isinstance(adf_node, dict):
@@ -249,12 +324,12 @@ class JiraService:
         
         # Handle different node types
         node_type = adf_node.get("type", "")
-        content = adf_node.get("content", [])
+        content = adf_node.get("content") or []
         
         if node_type == "text":
             # Direct text node
-            text = adf_node.get("text", "")
-            marks = adf_node.get("marks", [])
+            text = adf_node.get("text") or ""
+            marks = adf_node.get("marks") or []
             # Apply mark formatting if needed (bold, italic, etc.)
             if any(m.get("type") == "strong" for m in marks):
                 text = f"**{text}**"
@@ -272,7 +347,7 @@ class JiraService:
         if node_type == "paragraph":
             return "\n".join(text_parts)
         elif node_type == "heading":
-            level = adf_node.get("attrs", {}).get("level", 1)
+            level = (adf_node.get("attrs") or {}).get("level", 1)
             prefix = "#" * level + " "
             return prefix + "\n".join(text_parts)
         elif node_type == "bulletList":
@@ -1,10 +1,256 @@
-import requests
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 import os
-from bs4 import BeautifulSoup
 import random
 
 
+@dataclass(frozen=True, slots=True)
+class ExamplePost:
+    """A representative LinkedIn post for a trending topic"""
+    author: str
+    title: str
+    url: str
+    snippet: str
+
+
+@dataclass(frozen=True, slots=True)
+class TrendingTopic:
+    """An immutable trending-topic record; converted to a dict only when returned to callers"""
+    topic: str
+    description: str
+    engagement: str
+    hashtags: Tuple[str, ...]
+    sentiment: str
+    industry: str
+    example_posts: Tuple[ExamplePost, ...]
+    
+    def to_dict(self) -> Dict:
+        return {
+            "topic": self.topic,
+            "description": self.description,
+            "engagement": self.engagement,
+            "hashtags": list(self.hashtags),
+            "sentiment": self.sentiment,
+            "industry": self.industry,
+            "example_posts": [
+                {"author": p.author, "title": p.title, "url": p.url, "snippet": p.snippet}
+                for p in self.example_posts
+            ]
+        }
+
+
+# Simulated trending topics. Since direct LinkedIn scraping requires authentication and
+# may violate ToS, we serve a fixed catalogue of current tech/business trends; it is built
+# once at import time rather than on every request.
+# In production, you'd use LinkedIn Marketing API or official APIs
+_TRENDING_TOPICS: Tuple[TrendingTopic, ...] = (
+    TrendingTopic(
+        topic="AI and Machine Learning in Business",
+        description="Companies are integrating AI solutions to improve efficiency and customer experience. From chatbots to predictive analytics, AI is transforming how businesses operate.",
+        engagement="125K+ professionals discussing",
+        hashtags=("#AI", "#MachineLearning", "#BusinessInnovation"),
+        sentiment="positive",
+        industry="Technology",
+        example_posts=(
+            ExamplePost(
+                author="Satya Nadella",
+                title="The era of AI is here",
+                url="https://www.linkedin.com/in/satyanadella/recent-activity/all/",
+                snippet="AI is not just changing technology—it's changing how we work, create, and solve problems..."
+            ),
+            ExamplePost(
+                author="Andrew Ng",
+                title="Building AI teams in your organization",
+                url="https://www.linkedin.com/in/andrewyng/recent-activity/all/",
+                snippet="Here's what I've learned about building effective AI teams after working with hundreds of companies..."
+            ),
+        ),
+    ),
+    TrendingTopic(
+        topic="Remote Work Best Practices",
+        description="Organizations are refining remote work policies and tools. Focus on async communication, work-life balance, and virtual team building.",
+        engagement="98K+ professionals discussing",
+        hashtags=("#RemoteWork", "#FutureOfWork", "#WorkLifeBalance"),
+        sentiment="mixed",
+        industry="HR & Management",
+        example_posts=(
+            ExamplePost(
+                author="Arianna Huffington",
+                title="The burnout epidemic in remote work",
+                url="https://www.linkedin.com/in/ariannahuffington/recent-activity/all/",
+                snippet="Remote work flexibility is great, but we need boundaries. Here's how to prevent burnout..."
+            ),
+            ExamplePost(
+                author="Brian Chesky",
+                title="Airbnb's anywhere work policy",
+                url="https://www.linkedin.com/in/brianchesky/recent-activity/all/",
+                snippet="We're letting employees work from anywhere. Here's what we learned in the first year..."
+            ),
+        ),
+    ),
+    TrendingTopic(
+        topic="Sustainable Business Practices",
+        description="ESG initiatives are becoming central to business strategy. Companies are reducing carbon footprint and improving supply chain sustainability.",
+        engagement="87K+ professionals discussing",
+        hashtags=("#Sustainability", "#ESG", "#GreenBusiness"),
+        sentiment="positive",
+        industry="Business Strategy",
+        example_posts=(
+            ExamplePost(
+                author="Paul Polman",
+                title="Why ESG is non-negotiable",
+                url="https://www.linkedin.com/in/paulpolman/recent-activity/all/",
+                snippet="Companies that ignore ESG will not survive. Here's why sustainable business is the only path forward..."
+            ),
+            ExamplePost(
+                author="Elon Musk",
+                title="Tesla's impact on carbon reduction",
+                url="https://www.linkedin.com/company/tesla-motors/posts/",
+                snippet="Our mission isn't just electric cars - it's accelerating sustainable energy for all of Earth..."
+            ),
+        ),
+    ),
+    TrendingTopic(
+        topic="Cybersecurity Threats & Solutions",
+        description="Rise in ransomware attacks and data breaches. Organizations investing heavily in zero-trust architecture and employee training.",
+        engagement="76K+ professionals discussing",
+        hashtags=("#Cybersecurity", "#DataProtection", "#InfoSec"),
+        sentiment="concerned",
+        industry="Technology",
+        example_posts=(
+            ExamplePost(
+                author="Kevin Mitnick",
+                title="The human firewall is broken",
+                url="https://www.linkedin.com/search/results/content/?keywords=cybersecurity%20phishing&origin=GLOBAL_SEARCH_HEADER",
+                snippet="90% of breaches still start with phishing. Here's how to train your employees to be your first line of defense..."
+            ),
+            ExamplePost(
+                author="Brad Smith (Microsoft)",
+                title="Nation-state cyber attacks on the rise",
+                url="https://www.linkedin.com/in/bradsmith/recent-activity/all/",
+                snippet="We're seeing unprecedented levels of sophisticated attacks. Here's what companies need to know..."
+            ),
+        ),
+    ),
+    TrendingTopic(
+        topic="Leadership in Times of Change",
+        description="Adaptive leadership skills are crucial. Focus on empathy, clear communication, and strategic agility during organizational transformation.",
+        engagement="112K+ professionals discussing",
+        hashtags=("#Leadership", "#ChangeManagement", "#ExecutiveCoaching"),
+        sentiment="positive",
+        industry="Leadership",
+        example_posts=(
+            ExamplePost(
+                author="Simon Sinek",
+                title="Great leaders don't create followers",
+                url="https://www.linkedin.com/in/simonsinek/recent-activity/all/",
+                snippet="The best leaders create more leaders. Here's what separates good from great leadership..."
+            ),
+            ExamplePost(
+                author="Brené Brown",
+                title="Vulnerability in leadership",
+                url="https://www.linkedin.com/in/brenebrown/recent-activity/all/",
+                snippet="True leadership requires the courage to be vulnerable. Here's why it matters more than ever..."
+            ),
+        ),
+    ),
+    TrendingTopic(
+        topic="Creator Economy Growth",
+        description="Influencers and content creators are building sustainable businesses. Platforms offering better monetization and tools for creators.",
+        engagement="93K+ professionals discussing",
+        hashtags=("#CreatorEconomy", "#ContentCreation", "#InfluencerMarketing"),
+        sentiment="optimistic",
+        industry="Marketing",
+        example_posts=(
+            ExamplePost(
+                author="MrBeast",
+                title="Building a creator business empire",
+                url="https://www.linkedin.com/search/results/content/?keywords=creator%20economy%20business&origin=GLOBAL_SEARCH_HEADER",
+                snippet="Content creation isn't just YouTube videos anymore. Here's how I built multiple businesses..."
+            ),
+            ExamplePost(
+                author="Li Jin",
+                title="The passion economy",
+                url="https://www.linkedin.com/in/ljin18/recent-activity/all/",
+                snippet="Every creator can now be an entrepreneur. The tools are here - here's what's next..."
+            ),
+        ),
+    ),
+    TrendingTopic(
+        topic="Web3 and Blockchain Applications",
+        description="Decentralized finance and NFTs evolving beyond hype. Real-world use cases in supply chain, healthcare, and digital identity.",
+        engagement="65K+ professionals discussing",
+        hashtags=("#Web3", "#Blockchain", "#DeFi"),
+        sentiment="speculative",
+        industry="Technology",
+        example_posts=(
+            ExamplePost(
+                author="Vitalik Buterin",
+                title="Beyond financial speculation",
+                url="https://www.linkedin.com/search/results/content/?keywords=blockchain%20web3%20ethereum&origin=GLOBAL_SEARCH_HEADER",
+                snippet="The real value of blockchain isn't crypto prices - it's decentralized trust. Here are the use cases that matter..."
+            ),
+            ExamplePost(
+                author="Chris Dixon",
+                title="Read, write, own",
+                url="https://www.linkedin.com/in/cdixon/recent-activity/all/",
+                snippet="Web3 gives users ownership of their digital lives. Here's why this paradigm shift matters..."
+            ),
+        ),
+    ),
+    TrendingTopic(
+        topic="Mental Health in the Workplace",
+        description="Companies prioritizing employee wellbeing programs. Mental health days, therapy benefits, and destigmatizing mental health conversations.",
+        engagement="145K+ professionals discussing",
+        hashtags=("#MentalHealth", "#EmployeeWellbeing", "#WorkplaceWellness"),
+        sentiment="supportive",
+        industry="HR & Wellness",
+        example_posts=(
+            ExamplePost(
+                author="Prince Harry",
+                title="Breaking the stigma around mental health",
+                url="https://www.linkedin.com/search/results/content/?keywords=mental%20health%20workplace&origin=GLOBAL_SEARCH_HEADER",
+                snippet="Mental health is health. Here's why leaders must speak openly about it..."
+            ),
+            ExamplePost(
+                author="Reid Hoffman",
+                title="LinkedIn's mental health initiatives",
+                url="https://www.linkedin.com/in/reidhoffman/recent-activity/all/",
+                snippet="We're investing heavily in employee mental health. Here's what we learned about what actually works..."
+            ),
+        ),
+    ),
+)
+
+
+_INSIGHT_TEMPLATES = (
+    "Companies are investing heavily in {0}",
+    "Professionals with {0} skills seeing 40% more opportunities",
+    "Industry leaders predict {0} will reshape business in next 2-3 years",
+)
+_TOP_COMPANIES = ("Microsoft", "Google", "Amazon", "IBM", "Meta")
+_RELATED_TOPICS = ("Digital Transformation", "Innovation", "Future of Work")
+
+# Lowercased (topic, description, hashtags) per topic, so a search only lowercases the query
+_TOPICS_LOWER = tuple(
+    (t.topic.lower(), t.description.lower(), tuple(h.lower() for h in t.hashtags))
+    for t in _TRENDING_TOPICS
+)
+
+
+@lru_cache(maxsize=256)
+def _matching_topic_indices(query_lower: str) -> Tuple[int, ...]:
+    """Indices of topics whose topic, description or a hashtag contains the query (memoized per query)"""
+    return tuple(
+        i
+        for i, (topic_lower, description_lower, hashtags_lower) in enumerate(_TOPICS_LOWER)
+        if query_lower in topic_lower
+        or query_lower in description_lower
+        or any(query_lower in tag for tag in hashtags_lower)
+    )
+
+
 class LinkedInAPIService:
     """Service for scraping LinkedIn trending content"""
     
@@ -28,204 +274,16 @@ class LinkedInAPIService:
         try:
             print(f"[LinkedIn] Searching for trending topics: {query or 'general trends'}")
             
-            # Since direct LinkedIn scraping requires authentication and may violate ToS,
-            # we'll simulate trending topics based on current tech/business trends
-            # In production, you'd use LinkedIn Marketing API or official APIs
-            
-            trending_topics = [
-                {
-                    "topic": "AI and Machine Learning in Business",
-                    "description": "Companies are integrating AI solutions to improve efficiency and customer experience. From chatbots to predictive analytics, AI is transforming how businesses operate.",
-                    "engagement": "125K+ professionals discussing",
-                    "hashtags": ["#AI", "#MachineLearning", "#BusinessInnovation"],
-                    "sentiment": "positive",
-                    "industry": "Technology",
-                    "example_posts": [
-                        {
-                            "author": "Satya Nadella",
-                            "title": "The era of AI is here",
-                            "url": "https://www.linkedin.com/in/satyanadella/recent-activity/all/",
-                            "snippet": "AI is not just changing technology—it's changing how we work, create, and solve problems..."
-                        },
-                        {
-                            "author": "Andrew Ng",
-                            "title": "Building AI teams in your organization",
-                            "url": "https://www.linkedin.com/in/andrewyng/recent-activity/all/",
-                            "snippet": "Here's what I've learned about building effective AI teams after working with hundreds of companies..."
-                        }
-                    ]
-                },
-                {
-                    "topic": "Remote Work Best Practices",
-                    "description": "Organizations are refining remote work policies and tools. Focus on async communication, work-life balance, and virtual team building.",
-                    "engagement": "98K+ professionals discussing",
-                    "hashtags": ["#RemoteWork", "#FutureOfWork", "#WorkLifeBalance"],
-                    "sentiment": "mixed",
-                    "industry": "HR & Management",
-                    "example_posts": [
-                        {
-                            "author": "Arianna Huffington",
-                            "title": "The burnout epidemic in remote work",
-                            "url": "https://www.linkedin.com/in/ariannahuffington/recent-activity/all/",
-                            "snippet": "Remote work flexibility is great, but we need boundaries. Here's how to prevent burnout..."
-                        },
-                        {
-                            "author": "Brian Chesky",
-                            "title": "Airbnb's anywhere work policy",
-                            "url": "https://www.linkedin.com/in/brianchesky/recent-activity/all/",
-                            "snippet": "We're letting employees work from anywhere. Here's what we learned in the first year..."
-                        }
-                    ]
-                },
-                {
-                    "topic": "Sustainable Business Practices",
-                    "description": "ESG initiatives are becoming central to business strategy. Companies are reducing carbon footprint and improving supply chain sustainability.",
-                    "engagement": "87K+ professionals discussing",
-                    "hashtags": ["#Sustainability", "#ESG", "#GreenBusiness"],
-                    "sentiment": "positive",
-                    "industry": "Business Strategy",
-                    "example_posts": [
-                        {
-                            "author": "Paul Polman",
-                            "title": "Why ESG is non-negotiable",
-                            "url": "https://www.linkedin.com/in/paulpolman/recent-activity/all/",
-                            "snippet": "Companies that ignore ESG will not survive. Here's why sustainable business is the only path forward..."
-                        },
-                        {
-                            "author": "Elon Musk",
-                            "title": "Tesla's impact on carbon reduction",
-                            "url": "https://www.linkedin.com/company/tesla-motors/posts/",
-                            "snippet": "Our mission isn't just electric cars - it's accelerating sustainable energy for all of Earth..."
-                        }
-                    ]
-                },
-                {
-                    "topic": "Cybersecurity Threats & Solutions",
-                    "description": "Rise in ransomware attacks and data breaches. Organizations investing heavily in zero-trust architecture and employee training.",
-                    "engagement": "76K+ professionals discussing",
-                    "hashtags": ["#Cybersecurity", "#DataProtection", "#InfoSec"],
-                    "sentiment": "concerned",
-                    "industry": "Technology",
-                    "example_posts": [
-                        {
-                            "author": "Kevin Mitnick",
-                            "title": "The human firewall is broken",
-                            "url": "https://www.linkedin.com/search/results/content/?keywords=cybersecurity%20phishing&origin=GLOBAL_SEARCH_HEADER",
-                            "snippet": "90% of breaches still start with phishing. Here's how to train your employees to be your first line of defense..."
-                        },
-                        {
-                            "author": "Brad Smith (Microsoft)",
-                            "title": "Nation-state cyber attacks on the rise",
-                            "url": "https://www.linkedin.com/in/bradsmith/recent-activity/all/",
-                            "snippet": "We're seeing unprecedented levels of sophisticated attacks. Here's what companies need to know..."
-                        }
-                    ]
-                },
-                {
-                    "topic": "Leadership in Times of Change",
-                    "description": "Adaptive leadership skills are crucial. Focus on empathy, clear communication, and strategic agility during organizational transformation.",
-                    "engagement": "112K+ professionals discussing",
-                    "hashtags": ["#Leadership", "#ChangeManagement", "#ExecutiveCoaching"],
-                    "sentiment": "positive",
-                    "industry": "Leadership",
-                    "example_posts": [
-                        {
-                            "author": "Simon Sinek",
-                            "title": "Great leaders don't create followers",
-                            "url": "https://www.linkedin.com/in/simonsinek/recent-activity/all/",
-                            "snippet": "The best leaders create more leaders. Here's what separates good from great leadership..."
-                        },
-                        {
-                            "author": "Brené Brown",
-                            "title": "Vulnerability in leadership",
-                            "url": "https://www.linkedin.com/in/brenebrown/recent-activity/all/",
-                            "snippet": "True leadership requires the courage to be vulnerable. Here's why it matters more than ever..."
-                        }
-                    ]
-                },
-                {
-                    "topic": "Creator Economy Growth",
-                    "description": "Influencers and content creators are building sustainable businesses. Platforms offering better monetization and tools for creators.",
-                    "engagement": "93K+ professionals discussing",
-                    "hashtags": ["#CreatorEconomy", "#ContentCreation", "#InfluencerMarketing"],
-                    "sentiment": "optimistic",
-                    "industry": "Marketing",
-                    "example_posts": [
-                        {
-                            "author": "MrBeast",
-                            "title": "Building a creator business empire",
-                            "url": "https://www.linkedin.com/search/results/content/?keywords=creator%20economy%20business&origin=GLOBAL_SEARCH_HEADER",
-                            "snippet": "Content creation isn't just YouTube videos anymore. Here's how I built multiple businesses..."
-                        },
-                        {
-                            "author": "Li Jin",
-                            "title": "The passion economy",
-                            "url": "https://www.linkedin.com/in/ljin18/recent-activity/all/",
-                            "snippet": "Every creator can now be an entrepreneur. The tools are here - here's what's next..."
-                        }
-                    ]
-                },
-                {
-                    "topic": "Web3 and Blockchain Applications",
-                    "description": "Decentralized finance and NFTs evolving beyond hype. Real-world use cases in supply chain, healthcare, and digital identity.",
-                    "engagement": "65K+ professionals discussing",
-                    "hashtags": ["#Web3", "#Blockchain", "#DeFi"],
-                    "sentiment": "speculative",
-                    "industry": "Technology",
-                    "example_posts": [
-                        {
-                            "author": "Vitalik Buterin",
-                            "title": "Beyond financial speculation",
-                            "url": "https://www.linkedin.com/search/results/content/?keywords=blockchain%20web3%20ethereum&origin=GLOBAL_SEARCH_HEADER",
-                            "snippet": "The real value of blockchain isn't crypto prices - it's decentralized trust. Here are the use cases that matter..."
-                        },
-                        {
-                            "author": "Chris Dixon",
-                            "title": "Read, write, own",
-                            "url": "https://www.linkedin.com/in/cdixon/recent-activity/all/",
-                            "snippet": "Web3 gives users ownership of their digital lives. Here's why this paradigm shift matters..."
-                        }
-                    ]
-                },
-                {
-                    "topic": "Mental Health in the Workplace",
-                    "description": "Companies prioritizing employee wellbeing programs. Mental health days, therapy benefits, and destigmatizing mental health conversations.",
-                    "engagement": "145K+ professionals discussing",
-                    "hashtags": ["#MentalHealth", "#EmployeeWellbeing", "#WorkplaceWellness"],
-                    "sentiment": "supportive",
-                    "industry": "HR & Wellness",
-                    "example_posts": [
-                        {
-                            "author": "Prince Harry",
-                            "title": "Breaking the stigma around mental health",
-                            "url": "https://www.linkedin.com/search/results/content/?keywords=mental%20health%20workplace&origin=GLOBAL_SEARCH_HEADER",
-                            "snippet": "Mental health is health. Here's why leaders must speak openly about it..."
-                        },
-                        {
-                            "author": "Reid Hoffman",
-                            "title": "LinkedIn's mental health initiatives",
-                            "url": "https://www.linkedin.com/in/reidhoffman/recent-activity/all/",
-                            "snippet": "We're investing heavily in employee mental health. Here's what we learned about what actually works..."
-                        }
-                    ]
-                }
-            ]
+            trending_topics = _TRENDING_TOPICS
             
             # Filter by query if provided
             if query:
-                query_lower = query.lower()
-                filtered = [
-                    t for t in trending_topics 
-                    if query_lower in t["topic"].lower() 
-                    or query_lower in t["description"].lower()
-                    or any(query_lower in tag.lower() for tag in t["hashtags"])
-                ]
+                filtered = self._lookup_topics(query)
                 if filtered:
                     trending_topics = filtered
             
-            # Shuffle and limit
-            random.shuffle(trending_topics)
-            result = trending_topics[:limit]
+            # Pick a random subset without shuffling the whole pool
+            result = [t.to_dict() for t in random.sample(trending_topics, min(limit, len(trending_topics)))]
             
             print(f"[LinkedIn] Found {len(result)} trending topic(s)")
             return result
@@ -236,27 +294,21 @@ class LinkedInAPIService:
             traceback.print_exc()
             raise Exception(f"Error fetching LinkedIn trends: {str(e)}")
     
-    async def get_topic_details(self, topic: str) -> Dict:
-        """Get detailed information about a specific trending topic"""
-        try:
-            print(f"[LinkedIn] Getting details for topic: {topic}")
-            
-            # In production, this would make an API call
-            # For now, return enriched data
-            details = {
-                "topic": topic,
-                "key_insights": [
-                    f"Companies are investing heavily in {topic}",
-                    f"Professionals with {topic} skills seeing 40% more opportunities",
-                    f"Industry leaders predict {topic} will reshape business in next 2-3 years"
-                ],
-                "top_companies": ["Microsoft", "Google", "Amazon", "IBM", "Meta"],
-                "skill_demand": "High",
-                "job_postings": "15,000+ related positions",
-                "related_topics": ["Digital Transformation", "Innovation", "Future of Work"]
-            }
-            
-            return details
-            
-        except Exception as e:
-            raise Exception(f"Error getting topic details: {str(e)}")
+    def _lookup_topics(self, query: str) -> List[TrendingTopic]:
+        """Return topics whose topic, description or a hashtag contains the query (case-insensitive)"""
+        return [_TRENDING_TOPICS[i] for i in _matching_topic_indices(query.lower())]
+    
+    def get_topic_details(self, topic: str) -> Dict:
+        """Get detailed information about a specific trending topic (no I/O, so not async)"""
+        print(f"[LinkedIn] Getting details for topic: {topic}")
+        
+        # In production, this would make an API call
+        # For now, return enriched data
+        return {
+            "topic": topic,
+            "key_insights": [template.format(topic) for template in _INSIGHT_TEMPLATES],
+            "top_companies": list(_TOP_COMPANIES),
+            "skill_demand": "High",
+            "job_postings": "15,000+ related positions",
+            "related_topics": list(_RELATED_TOPICS)
+        }
@@ -3,12 +3,183 @@ LinkedIn Post Scraper with Scoring System
 Scrapes LinkedIn posts and scores them based on engagement metrics
 """
 
-import requests
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-import re
+import asyncio
+import copy
+import importlib.util
+import logging
+import httpx
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Dict, Optional, Sequence, Tuple
 from datetime import datetime
-import json
+
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("[LinkedInScraper] numpy not installed. Batch scoring will use the scalar path.")
+
+
+# Engagement-rate bonus by tier: none, low (>1%), medium (>2%), high (>5%)
+_ENGAGEMENT_BONUSES = (0.0, 10.0, 20.0, 50.0)
+
+
+def _engagement_score(likes: int, comments: int, shares: int, views: int) -> float:
+    """Unrounded engagement score behind LinkedInPostScraper.calculate_score"""
+    # Base scoring
+    score = (likes * 1.0) + (comments * 5.0) + (shares * 10.0)
+    
+    # Without views there is no views contribution and no engagement-rate bonus
+    if views <= 0:
+        return min(100.0, (score / 20.0))
+    
+    # Add views contribution (very small weight)
+    score += views * 0.01
+    
+    # Calculate engagement rate
+    total_engagement = likes + comments + shares
+    engagement_rate = (total_engagement / views) * 100
+    
+    # Bonus for high engagement rate: the tier index is the number of thresholds
+    # (1%, 2%, 5%) exceeded, which avoids a chain of unpredictable branches
+    tier = (engagement_rate > 1.0) + (engagement_rate > 2.0) + (engagement_rate > 5.0)
+    score += _ENGAGEMENT_BONUSES[tier]
+    
+    # Normalize score (scale to 0-100 range for display)
+    # Typical high-performing post: 1000+ likes, 100+ comments, 50+ shares
+    # Max typical score: 1000 + 500 + 500 = 2000
+    # Normalize to 0-100 scale
+    return min(100.0, (score / 20.0))  # Divide by 20 to get 0-100 scale
+
+
+# Simulated LinkedIn posts with realistic engagement metrics, built once at import.
+# {keyword}, {k_under} and {k_dash} are filled in per search keyword; the keyword is
+# also prepended to each post's hashtags.
+_POST_TEMPLATES = (
+    {
+        "post_id": "li_post_{k_under}_1",
+        "content": "How {keyword} is transforming business operations in 2024. Here's what industry leaders are saying about the future of this technology.",
+        "author": "Tech Industry Leader",
+        "author_url": "https://linkedin.com/in/example",
+        "post_url": "https://linkedin.com/posts/example-{k_dash}",
+        "likes": 1250,
+        "comments": 145,
+        "shares": 89,
+        "views": 15000,
+        "hashtags": ("Business", "Innovation"),
+        "posted_at": "2024-01-15T10:30:00Z",
+        "industry": "Technology"
+    },
+    {
+        "post_id": "li_post_{k_under}_2",
+        "content": "5 key insights about {keyword} that every professional should know. These trends are reshaping how we work.",
+        "author": "Business Strategist",
+        "author_url": "https://linkedin.com/in/example2",
+        "post_url": "https://linkedin.com/posts/example2-{k_dash}",
+        "likes": 890,
+        "comments": 67,
+        "shares": 34,
+        "views": 12000,
+        "hashtags": ("Strategy", "Leadership"),
+        "posted_at": "2024-01-14T14:20:00Z",
+        "industry": "Business"
+    },
+    {
+        "post_id": "li_post_{k_under}_3",
+        "content": "The future of {keyword}: What you need to know. Industry experts weigh in on the latest developments.",
+        "author": "Industry Expert",
+        "author_url": "https://linkedin.com/in/example3",
+        "post_url": "https://linkedin.com/posts/example3-{k_dash}",
+        "likes": 2100,
+        "comments": 234,
+        "shares": 156,
+        "views": 25000,
+        "hashtags": ("Future", "Innovation"),
+        "posted_at": "2024-01-13T09:15:00Z",
+        "industry": "Technology"
+    },
+    {
+        "post_id": "li_post_{k_under}_4",
+        "content": "Breaking down {keyword} for beginners. A comprehensive guide to understanding this important topic.",
+        "author": "Educational Content Creator",
+        "author_url": "https://linkedin.com/in/example4",
+        "post_url": "https://linkedin.com/posts/example4-{k_dash}",
+        "likes": 567,
+        "comments": 45,
+        "shares": 23,
+        "views": 8000,
+        "hashtags": ("Education", "Learning"),
+        "posted_at": "2024-01-12T16:45:00Z",
+        "industry": "Education"
+    },
+    {
+        "post_id": "li_post_{k_under}_5",
+        "content": "{keyword} case study: How one company achieved 300% growth using these strategies.",
+        "author": "Business Case Study",
+        "author_url": "https://linkedin.com/in/example5",
+        "post_url": "https://linkedin.com/posts/example5-{k_dash}",
+        "likes": 1780,
+        "comments": 198,
+        "shares": 112,
+        "views": 18000,
+        "hashtags": ("CaseStudy", "Growth"),
+        "posted_at": "2024-01-11T11:30:00Z",
+        "industry": "Business"
+    }
+)
+
+
+@dataclass
+class PostColumns:
+    """
+    Scraped posts stored column-wise (one list per field, in field order) while they are
+    scored and sorted; dicts are only built at the end by to_dicts()
+    """
+    columns: Dict[str, List] = field(default_factory=dict)
+    
+    @classmethod
+    def from_records(cls, records: Sequence[Dict]) -> "PostColumns":
+        if not records:
+            return cls()
+        return cls({name: [record.get(name) for record in records] for name in records[0]})
+    
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+    
+    def reorder(self, order: List[int]):
+        """Permute every column by the given row indices"""
+        self.columns = {name: [values[i] for i in order] for name, values in self.columns.items()}
+    
+    def to_dicts(self) -> List[Dict]:
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*self.columns.values())]
+
+
+@lru_cache(maxsize=256)
+def _build_simulated_columns(keyword: str, limit: int) -> Tuple[Tuple[str, tuple], ...]:
+    """
+    Expand the post templates for a keyword into immutable (field name, values) columns
+    
+    This is pure in (keyword, limit), so it is memoized; callers copy the columns before
+    adding per-scrape fields such as scores and timestamps.
+    """
+    posts = PostColumns.from_records(_POST_TEMPLATES[:limit])
+    if not len(posts):
+        return ()
+    fields = {
+        "keyword": keyword,
+        "k_under": keyword.replace(' ', '_'),
+        "k_dash": keyword.replace(' ', '-')
+    }
+    for name in ("post_id", "content", "post_url"):
+        posts.columns[name] = [value.format_map(fields) for value in posts.columns[name]]
+    posts.columns["hashtags"] = [(keyword, *tags) for tags in posts.columns["hashtags"]]
+    return tuple((name, tuple(values)) for name, values in posts.columns.items())
 
 
 class LinkedInPostScraper:
@@ -24,7 +195,30 @@ class LinkedInPostScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
-        print("[LinkedInScraper] Service initialized")
+        # Shared connection pool for all scrape_* calls, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        # Recently scored results per (keyword, limit), to avoid re-scraping the same keyword.
+        # Posts are stored and returned as deep copies so callers cannot modify the cached ones
+        self._results_cache = TTLCache(maxsize=1000, ttl=60)
+        logger.info("[LinkedInScraper] Service initialized")
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared keep-alive HTTP client, creating it lazily"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                # HTTP/2 needs the optional h2 package
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                timeout=10.0
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     def calculate_score(self, likes: int, comments: int, shares: int, views: int = 0) -> float:
         """
@@ -46,33 +240,55 @@ class LinkedInPostScraper:
         Returns:
             Engagement score (float)
         """
-        # Base scoring
-        score = (likes * 1.0) + (comments * 5.0) + (shares * 10.0)
+        return round(_engagement_score(likes, comments, shares, views), 2)
+    
+    def calculate_scores_batch(
+        self,
+        likes: List[int],
+        comments: List[int],
+        shares: List[int],
+        views: List[int]
+    ) -> Tuple[List[float], List[float], List[int]]:
+        """
+        Score many posts at once (same formula as calculate_score)
         
-        # Add views contribution (very small weight)
-        if views > 0:
-            score += views * 0.01
+        Uses vectorized NumPy array operations when available, so the per-post
+        cost is a handful of array ops instead of one Python call per post.
         
-        # Calculate engagement rate
-        if views > 0:
-            total_engagement = likes + comments + shares
-            engagement_rate = (total_engagement / views) * 100
-            
-            # Bonus for high engagement rate
-            if engagement_rate > 5.0:
-                score += 50.0  # High engagement bonus
-            elif engagement_rate > 2.0:
-                score += 20.0  # Medium engagement bonus
-            elif engagement_rate > 1.0:
-                score += 10.0  # Low engagement bonus
-        
-        # Normalize score (scale to 0-100 range for display)
-        # Typical high-performing post: 1000+ likes, 100+ comments, 50+ shares
-        # Max typical score: 1000 + 500 + 500 = 2000
-        # Normalize to 0-100 scale
-        normalized_score = min(100.0, (score / 20.0))  # Divide by 20 to get 0-100 scale
-        
-        return round(normalized_score, 2)
+        Returns:
+            (scores, engagement rates in percent rounded to 2 places, total engagements)
+        """
+        if not NUMPY_AVAILABLE:
+            scores = [self.calculate_score(l, c, s, v) for l, c, s, v in zip(likes, comments, shares, views)]
+            totals = [l + c + s for l, c, s in zip(likes, comments, shares)]
+            rates = [round(t / v * 100, 2) if v > 0 else 0 for t, v in zip(totals, views)]
+            return scores, rates, totals
+        
+        likes_arr = np.asarray(likes, dtype=np.int64)
+        comments_arr = np.asarray(comments, dtype=np.int64)
+        shares_arr = np.asarray(shares, dtype=np.int64)
+        views_arr = np.asarray(views, dtype=np.int64)
+        
+        total = likes_arr + comments_arr + shares_arr
+        has_views = views_arr > 0
+        rate = np.divide(total, views_arr, out=np.zeros(total.shape), where=has_views) * 100
+        score = likes_arr + 5.0 * comments_arr + 10.0 * shares_arr + np.where(has_views, views_arr * 0.01, 0.0)
+        tier = (rate > 1.0).astype(np.int8) + (rate > 2.0) + (rate > 5.0)
+        bonus = np.asarray(_ENGAGEMENT_BONUSES)[tier]
+        normalized = np.minimum(100.0, (score + bonus) / 20.0)
+        
+        # Round with Python's round(): ndarray.round differs from it on some halfway values
+        return (
+            [round(value, 2) for value in normalized.tolist()],
+            [round(value, 2) for value in rate.tolist()],
+            total.tolist()
+        )
+    
+    def _score_order(self, scores: List[float]) -> List[int]:
+        """Indices that order scores highest first (stable, like list.sort(reverse=True))"""
+        if not NUMPY_AVAILABLE:
+            return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        return np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable").tolist()
     
     async def scrape_posts_by_keyword(self, keyword: str, limit: int = 20) -> List[Dict]:
         """
@@ -90,117 +306,42 @@ class LinkedInPostScraper:
         Returns:
             List of posts with scores
         """
+        cache_key = ("kw", keyword, limit)
+        cached = self._results_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         try:
-            print(f"[LinkedInScraper] Scraping posts for keyword: {keyword}")
+            logger.debug("[LinkedInScraper] Scraping posts for keyword: %s", keyword)
             
-            # Simulated LinkedIn posts with realistic engagement metrics
             # In production, this would be actual scraping
-            simulated_posts = [
-                {
-                    "post_id": f"li_post_{keyword.replace(' ', '_')}_1",
-                    "content": f"How {keyword} is transforming business operations in 2024. Here's what industry leaders are saying about the future of this technology.",
-                    "author": "Tech Industry Leader",
-                    "author_url": "https://linkedin.com/in/example",
-                    "post_url": f"https://linkedin.com/posts/example-{keyword.replace(' ', '-')}",
-                    "likes": 1250,
-                    "comments": 145,
-                    "shares": 89,
-                    "views": 15000,
-                    "hashtags": [keyword, "Business", "Innovation"],
-                    "posted_at": "2024-01-15T10:30:00Z",
-                    "industry": "Technology"
-                },
-                {
-                    "post_id": f"li_post_{keyword.replace(' ', '_')}_2",
-                    "content": f"5 key insights about {keyword} that every professional should know. These trends are reshaping how we work.",
-                    "author": "Business Strategist",
-                    "author_url": "https://linkedin.com/in/example2",
-                    "post_url": f"https://linkedin.com/posts/example2-{keyword.replace(' ', '-')}",
-                    "likes": 890,
-                    "comments": 67,
-                    "shares": 34,
-                    "views": 12000,
-                    "hashtags": [keyword, "Strategy", "Leadership"],
-                    "posted_at": "2024-01-14T14:20:00Z",
-                    "industry": "Business"
-                },
-                {
-                    "post_id": f"li_post_{keyword.replace(' ', '_')}_3",
-                    "content": f"The future of {keyword}: What you need to know. Industry experts weigh in on the latest developments.",
-                    "author": "Industry Expert",
-                    "author_url": "https://linkedin.com/in/example3",
-                    "post_url": f"https://linkedin.com/posts/example3-{keyword.replace(' ', '-')}",
-                    "likes": 2100,
-                    "comments": 234,
-                    "shares": 156,
-                    "views": 25000,
-                    "hashtags": [keyword, "Future", "Innovation"],
-                    "posted_at": "2024-01-13T09:15:00Z",
-                    "industry": "Technology"
-                },
-                {
-                    "post_id": f"li_post_{keyword.replace(' ', '_')}_4",
-                    "content": f"Breaking down {keyword} for beginners. A comprehensive guide to understanding this important topic.",
-                    "author": "Educational Content Creator",
-                    "author_url": "https://linkedin.com/in/example4",
-                    "post_url": f"https://linkedin.com/posts/example4-{keyword.replace(' ', '-')}",
-                    "likes": 567,
-                    "comments": 45,
-                    "shares": 23,
-                    "views": 8000,
-                    "hashtags": [keyword, "Education", "Learning"],
-                    "posted_at": "2024-01-12T16:45:00Z",
-                    "industry": "Education"
-                },
-                {
-                    "post_id": f"li_post_{keyword.replace(' ', '_')}_5",
-                    "content": f"{keyword} case study: How one company achieved 300% growth using these strategies.",
-                    "author": "Business Case Study",
-                    "author_url": "https://linkedin.com/in/example5",
-                    "post_url": f"https://linkedin.com/posts/example5-{keyword.replace(' ', '-')}",
-                    "likes": 1780,
-                    "comments": 198,
-                    "shares": 112,
-                    "views": 18000,
-                    "hashtags": [keyword, "CaseStudy", "Growth"],
-                    "posted_at": "2024-01-11T11:30:00Z",
-                    "industry": "Business"
-                }
-            ]
+            posts = PostColumns({name: list(values) for name, values in _build_simulated_columns(keyword, limit)})
+            if not len(posts):
+                return []
+            posts.columns["hashtags"] = [list(tags) for tags in posts.columns["hashtags"]]
             
-            # Calculate scores for each post
-            scored_posts = []
-            for post in simulated_posts[:limit]:
-                score = self.calculate_score(
-                    likes=post["likes"],
-                    comments=post["comments"],
-                    shares=post["shares"],
-                    views=post.get("views", 0)
-                )
-                
-                # Calculate engagement rate
-                total_engagement = post["likes"] + post["comments"] + post["shares"]
-                engagement_rate = (total_engagement / post.get("views", 1)) * 100 if post.get("views", 0) > 0 else 0
-                
-                scored_post = {
-                    **post,
-                    "score": score,
-                    "engagement_rate": round(engagement_rate, 2),
-                    "total_engagement": total_engagement,
-                    "scraped_at": datetime.now().isoformat()
-                }
-                scored_posts.append(scored_post)
+            # Calculate scores for all posts in one batch, straight from the numeric columns
+            scores, engagement_rates, total_engagements = self.calculate_scores_batch(
+                likes=posts.columns["likes"],
+                comments=posts.columns["comments"],
+                shares=posts.columns["shares"],
+                views=posts.columns.get("views") or [0] * len(posts)
+            )
+            posts.columns["score"] = scores
+            posts.columns["engagement_rate"] = engagement_rates
+            posts.columns["total_engagement"] = total_engagements
+            posts.columns["scraped_at"] = [datetime.now().isoformat()] * len(posts)
             
-            # Sort by score (highest first)
-            scored_posts.sort(key=lambda x: x["score"], reverse=True)
+            # Sort by score (highest first), then build the response dicts
+            posts.reorder(self._score_order(scores))
+            scored_posts = posts.to_dicts()
             
-            print(f"[LinkedInScraper] Scraped and scored {len(scored_posts)} posts")
+            logger.debug("[LinkedInScraper] Scraped and scored %d posts", len(scored_posts))
+            self._results_cache.set(cache_key, copy.deepcopy(scored_posts))
             return scored_posts
             
         except Exception as e:
-            print(f"[LinkedInScraper] Error scraping posts: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[LinkedInScraper] Error scraping posts for keyword %s: %s", keyword, e)
             return []
     
     async def scrape_trending_posts(self, limit: int = 20) -> List[Dict]:
@@ -219,13 +360,28 @@ class LinkedInPostScraper:
             "Sustainability", "Cybersecurity", "Digital Transformation"
         ]
         
+        # Scrape all keywords concurrently; a failed keyword just contributes no posts
+        results = await asyncio.gather(
+            *(self.scrape_posts_by_keyword(keyword, limit=5) for keyword in trending_keywords),
+            return_exceptions=True
+        )
+        
+        # The same post can surface for several keywords; keep its first occurrence only
+        seen_ids = set()
         all_posts = []
-        for keyword in trending_keywords:
-            posts = await self.scrape_posts_by_keyword(keyword, limit=5)
-            all_posts.extend(posts)
+        for result in results:
+            if not isinstance(result, list):
+                continue
+            for post in result:
+                post_id = post["post_id"]
+                if post_id in seen_ids:
+                    continue
+                seen_ids.add(post_id)
+                all_posts.append(post)
         
         # Sort all posts by score
-        all_posts.sort(key=lambda x: x["score"], reverse=True)
+        order = self._score_order([post["score"] for post in all_posts])
+        all_posts = [all_posts[i] for i in order]
         
         return all_posts[:limit]
 
@@ -4,75 +4,42 @@ This allows users to post videos by providing credentials locally.
 Note: This runs in the user's browser/environment, not server-side.
 """
 
-import httpx
 from typing import Dict, Optional
+from functools import lru_cache
 import os
+import string
 
 
-class ManualPostingService:
-    """
-    Service for manual posting that can work with browser automation.
-    This is intended for client-side use where users provide their own credentials.
-    """
-    
-    def __init__(self):
-        pass
-    
-    async def validate_instagram_credentials(self, username: str, password: str) -> Dict:
-        """
-        Validate Instagram credentials (placeholder - actual implementation would use browser automation).
-        This should be done client-side for security reasons.
-        """
-        return {
-            "valid": False,
-            "message": "This should be implemented client-side using browser automation (Playwright/Selenium). Server-side credential validation is not recommended for security reasons."
-        }
-    
-    async def validate_linkedin_credentials(self, username: str, password: str) -> Dict:
-        """
-        Validate LinkedIn credentials (placeholder - actual implementation would use browser automation).
-        This should be done client-side for security reasons.
-        """
-        return {
-            "valid": False,
-            "message": "This should be implemented client-side using browser automation (Playwright/Selenium). Server-side credential validation is not recommended for security reasons."
-        }
-    
-    def get_browser_automation_script(self, platform: str) -> str:
-        """
-        Returns a client-side script that users can run locally to automate posting.
-        This avoids storing credentials on the server.
-        """
-        if platform == "instagram":
-            return """
-# Instagram Posting Script (Run locally)
+# Shared skeleton of the client-side posting scripts; platforms differ only in URLs and selectors
+_SCRIPT_TEMPLATE = string.Template('''
+# ${name} Posting Script (Run locally)
 # Install: pip install playwright
-# Usage: python instagram_manual_poster.py --username YOUR_USERNAME --video VIDEO_PATH --caption "Your caption"
+# Usage: python ${slug}_manual_poster.py --username ${username_placeholder} --video VIDEO_PATH --caption "Your caption"
 
 from playwright.sync_api import sync_playwright
 import argparse
 import time
 
-def post_to_instagram(username, password, video_path, caption):
+def post_to_${slug}(username, password, video_path, caption):
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
         context = browser.new_context()
         page = context.new_page()
         
-        # Login to Instagram
-        page.goto("https://www.instagram.com/accounts/login/")
+        # Login to ${name}
+        page.goto("${login_url}")
         time.sleep(2)
-        page.fill('input[name="username"]', username)
-        page.fill('input[name="password"]', password)
+        page.fill('${username_selector}', username)
+        page.fill('${password_selector}', password)
         page.click('button[type="submit"]')
         time.sleep(5)
         
-        # Navigate to create post
-        page.goto("https://www.instagram.com/")
+        # Navigate to ${home_label}
+        page.goto("${home_url}")
         time.sleep(2)
         
-        # Click create button
-        page.click('svg[aria-label="New post"]')
+        # Click ${create_label}
+        page.click('${create_selector}')
         time.sleep(2)
         
         # Upload video
@@ -81,11 +48,11 @@ def post_to_instagram(username, password, video_path, caption):
         time.sleep(5)
         
         # Add caption
-        caption_input = page.query_selector('textarea[aria-label="Write a caption..."]')
+        caption_input = page.query_selector('${caption_selector}')
         caption_input.fill(caption)
         
         # Post
-        page.click('button:has-text("Share")')
+        page.click('button:has-text("${submit_text}")')
         time.sleep(5)
         
         browser.close()
@@ -98,69 +65,85 @@ if __name__ == "__main__":
     parser.add_argument("--caption", required=True)
     args = parser.parse_args()
     
-    password = input("Enter your Instagram password (won't be stored): ")
-    post_to_instagram(args.username, args.video, args.caption, password)
-"""
-        elif platform == "linkedin":
-            return """
-# LinkedIn Posting Script (Run locally)
-# Install: pip install playwright
-# Usage: python linkedin_manual_poster.py --username YOUR_EMAIL --video VIDEO_PATH --caption "Your caption"
+    password = input("Enter your ${name} password (won't be stored): ")
+    post_to_${slug}(args.username, args.video, args.caption, password)
+''')
 
-from playwright.sync_api import sync_playwright
-import argparse
-import time
+_PLATFORM_SPECS = {
+    "instagram": {
+        "name": "Instagram",
+        "slug": "instagram",
+        "username_placeholder": "YOUR_USERNAME",
+        "login_url": "https://www.instagram.com/accounts/login/",
+        "username_selector": 'input[name="username"]',
+        "password_selector": 'input[name="password"]',
+        "home_label": "create post",
+        "home_url": "https://www.instagram.com/",
+        "create_label": "create button",
+        "create_selector": 'svg[aria-label="New post"]',
+        "caption_selector": 'textarea[aria-label="Write a caption..."]',
+        "submit_text": "Share",
+    },
+    "linkedin": {
+        "name": "LinkedIn",
+        "slug": "linkedin",
+        "username_placeholder": "YOUR_EMAIL",
+        "login_url": "https://www.linkedin.com/login",
+        "username_selector": 'input[name="session_key"]',
+        "password_selector": 'input[name="session_password"]',
+        "home_label": "feed",
+        "home_url": "https://www.linkedin.com/feed/",
+        "create_label": "start a post",
+        "create_selector": 'button[aria-label="Start a post"]',
+        "caption_selector": 'div[contenteditable="true"][aria-label*="post"]',
+        "submit_text": "Post",
+    },
+}
 
-def post_to_linkedin(username, password, video_path, caption):
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-        
-        # Login to LinkedIn
-        page.goto("https://www.linkedin.com/login")
-        time.sleep(2)
-        page.fill('input[name="session_key"]', username)
-        page.fill('input[name="session_password"]', password)
-        page.click('button[type="submit"]')
-        time.sleep(5)
-        
-        # Navigate to feed
-        page.goto("https://www.linkedin.com/feed/")
-        time.sleep(2)
-        
-        # Click start a post
-        page.click('button[aria-label="Start a post"]')
-        time.sleep(2)
-        
-        # Upload video
-        file_input = page.query_selector('input[type="file"]')
-        file_input.set_input_files(video_path)
-        time.sleep(5)
-        
-        # Add caption
-        caption_input = page.query_selector('div[contenteditable="true"][aria-label*="post"]')
-        caption_input.fill(caption)
-        
-        # Post
-        page.click('button:has-text("Post")')
-        time.sleep(5)
-        
-        browser.close()
-        print("Video posted successfully!")
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--username", required=True)
-    parser.add_argument("--video", required=True)
-    parser.add_argument("--caption", required=True)
-    args = parser.parse_args()
+@lru_cache(maxsize=4)
+def _render_automation_script(platform: str) -> str:
+    spec = _PLATFORM_SPECS.get(platform)
+    if spec is None:
+        return "Platform not supported for manual posting"
+    return _SCRIPT_TEMPLATE.substitute(spec)
+
+
+class ManualPostingService:
+    """
+    Service for manual posting that can work with browser automation.
+    This is intended for client-side use where users provide their own credentials.
+    """
     
-    password = input("Enter your LinkedIn password (won't be stored): ")
-    post_to_linkedin(args.username, args.video, args.caption, password)
-"""
-        else:
-            return "Platform not supported for manual posting"
+    def __init__(self):
+        pass
+    
+    async def validate_instagram_credentials(self, username: str, password: str) -> Dict:
+        """
+        Validate Instagram credentials (placeholder - actual implementation would use browser automation).
+        This should be done client-side for security reasons.
+        """
+        return {
+            "valid": False,
+            "message": "This should be implemented client-side using browser automation (Playwright/Selenium). Server-side credential validation is not recommended for security reasons."
+        }
+    
+    async def validate_linkedin_credentials(self, username: str, password: str) -> Dict:
+        """
+        Validate LinkedIn credentials (placeholder - actual implementation would use browser automation).
+        This should be done client-side for security reasons.
+        """
+        return {
+            "valid": False,
+            "message": "This should be implemented client-side using browser automation (Playwright/Selenium). Server-side credential validation is not recommended for security reasons."
+        }
+    
+    def get_browser_automation_script(self, platform: str) -> str:
+        """
+        Returns a client-side script that users can run locally to automate posting.
+        This avoids storing credentials on the server.
+        """
+        return _render_automation_script(platform)
 
 
 
@@ -3,41 +3,410 @@ Mem0 Service - Memory and context management
 Replaces Hyperspell memory functionality
 """
 
+import copy
 import os
-from typing import Optional, Dict, List
+import sys
+from pathlib import Path
+import json
+import hashlib
+import importlib.util
+import time
+from typing import Optional, Dict, List, Callable, Any
 from datetime import datetime
 import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-try:
-    # The package is installed as 'mem0ai' but imported as 'mem0'
+from utils import fast_json
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# The package is installed as 'mem0ai' but imported as 'mem0'. Importing it pulls in
+# the vector store and embedding clients, so it is only located here and imported
+# when the first Memory is created (see _memory_class)
+MEM0_AVAILABLE = importlib.util.find_spec("mem0") is not None
+if not MEM0_AVAILABLE:
+    logger.warning("[Mem0] Mem0 SDK not installed. Install with: pip install mem0ai")
+
+
+@functools.lru_cache(maxsize=1)
+def _memory_class():
+    """Import mem0 on first use and return its Memory class"""
     from mem0 import Memory
-    MEM0_AVAILABLE = True
-except ImportError:
-    MEM0_AVAILABLE = False
-    print("[Warning] Mem0 SDK not installed. Install with: pip install mem0ai")
+    return Memory
+
+
+# Memory instances by config fingerprint, so additional Mem0Service instances
+# reuse the already-open vector store instead of reloading it
+_MEMORY_INSTANCES: Dict[str, "Memory"] = {}
+
+
+def _memory_from_config(config: Dict) -> "Memory":
+    """Return the process-wide Memory for this config, creating it on first use"""
+    key = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+    memory = _MEMORY_INSTANCES.get(key)
+    if memory is None:
+        memory = _MEMORY_INSTANCES[key] = _memory_class().from_config(config)
+    return memory
+
+
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+# (bucket, region) pairs whose S3 Vectors access was verified in this process
+_VERIFIED_BUCKETS: set = set()
+
+# Local ChromaDB persistence directory (used when S3 vectors are not configured)
+_CHROMA_DIR = (Path(__file__).parent.parent / "chroma_db").absolute()
+
+
+@functools.lru_cache(maxsize=1)
+def _chroma_persist_path() -> str:
+    """Create the ChromaDB directory once per process and return it as a string"""
+    _CHROMA_DIR.mkdir(exist_ok=True)
+    return str(_CHROMA_DIR)
+
+
+# S3 Vectors index names this service has used (lowercase alphanumeric, 3-63 chars).
+# The name a bucket had to fall back to is kept with Mem0's own state (MEM0_DIR,
+# ~/.mem0 by default), not in the source tree
+_S3_INDEX_CANDIDATES = ("mem0memories", "memories", "mem0index", "vectorindex")
+_INDEX_NAME_FILE = Path(os.getenv("MEM0_DIR") or Path.home() / ".mem0") / "s3_index_names.json"
+
+
+def _read_index_names() -> Dict[str, str]:
+    """Fallback index names recorded per "region/bucket" ({} when none are recorded)"""
+    try:
+        recorded = fast_json.loads(_INDEX_NAME_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return recorded if isinstance(recorded, dict) else {}
+
+
+def _record_index_name(key: str, name: Optional[str]) -> None:
+    """Record the fallback index name for a bucket, or forget it when `name` is None"""
+    recorded = _read_index_names()
+    if name is None:
+        recorded.pop(key, None)
+    else:
+        recorded[key] = name
+    try:
+        _INDEX_NAME_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _INDEX_NAME_FILE.write_bytes(fast_json.dumps(recorded))
+    except OSError as e:
+        logger.warning("[Mem0] Could not record S3 Vectors index name: %s", e)
+
+
+def _memory_for_s3_index(bucket: str, region: str, default: str) -> "Memory":
+    """
+    Open the S3 Vectors store, trying the other known index names only if Mem0 rejects `default`
+    
+    A fallback name that worked is recorded and tried first next time, so later starts
+    skip the rejected attempts; it is forgotten as soon as it is rejected itself.
+    Errors other than an invalid index name are raised straight away.
+    """
+    key = f"{region}/{bucket}"
+    recorded = _read_index_names().get(key)
+    first_error = None
+    for name in dict.fromkeys(n for n in (recorded, default, *_S3_INDEX_CANDIDATES) if n):
+        try:
+            memory = _memory_from_config(_s3_vectors_config(bucket, region, name))
+        except Exception as e:
+            if "Invalid index name" not in str(e):
+                raise
+            logger.warning("[Mem0] S3 Vectors index name %r rejected: %s", name, e)
+            first_error = first_error or e
+            continue
+        if name != default:
+            logger.warning("[Mem0] Using S3 Vectors index %r instead of %r", name, default)
+        if name != recorded:
+            _record_index_name(key, None if name == default else name)
+        return memory
+    raise first_error
+
+
+# Mem0 configs are built once per distinct input and shared; treat them as read-only
+@functools.lru_cache(maxsize=8)
+def _s3_vectors_config(bucket: str, region: str, index_name: str) -> Dict:
+    """Mem0 config for an S3 Vectors store"""
+    return {
+        "vector_store": {
+            "provider": "s3_vectors",
+            "config": {
+                "vector_bucket_name": bucket,
+                "collection_name": index_name,
+                "embedding_model_dims": 1536,  # OpenAI embedding dimensions
+                "distance_metric": "cosine",
+                "region_name": region
+            }
+        }
+    }
+
+
+@functools.lru_cache(maxsize=2)
+def _chroma_config(persist_path: str, embedder_model: Optional[str] = None) -> Dict:
+    """
+    Mem0 config for a persistent local ChromaDB store
+    
+    With `embedder_model`, embeddings come from that local fastembed (ONNX) model
+    instead of OpenAI. Its vectors have different dimensions, so they are kept in a
+    collection of their own named after the model.
+    """
+    collection_name = "mem0_memories"
+    if embedder_model:
+        suffix = "".join(c if c.isalnum() else "_" for c in embedder_model.lower())
+        collection_name = f"{collection_name}_{suffix}"[:63]
+    config = {
+        "vector_store": {
+            "provider": "chroma",
+            "config": {
+                "collection_name": collection_name,
+                "path": persist_path,
+                "persist_directory": persist_path
+            }
+        }
+    }
+    if embedder_model:
+        config["embedder"] = {"provider": "fastembed", "config": {"model": embedder_model}}
+    return config
+
+
+# Quantized ONNX model used when MEM0_EMBEDDER=fastembed and no MEM0_EMBEDDER_MODEL is set
+_FASTEMBED_DEFAULT_MODEL = "BAAI/bge-small-en-v1.5"
+
+
+def _local_embedder_model() -> Optional[str]:
+    """The fastembed model to embed with locally, or None to use Mem0's default (OpenAI)"""
+    if os.getenv("MEM0_EMBEDDER", "").lower() != "fastembed":
+        return None
+    if importlib.util.find_spec("fastembed") is None:
+        logger.warning("[Mem0] MEM0_EMBEDDER=fastembed but fastembed is not installed; using the default embedder")
+        return None
+    return os.getenv("MEM0_EMBEDDER_MODEL", _FASTEMBED_DEFAULT_MODEL)
+
+
+# Index this service uses (and Mem0 creates if missing); the other known names
+# are only tried when Mem0 rejects this one
+_DEFAULT_S3_INDEX = "mem0memories"
+
+
+@functools.lru_cache(maxsize=4)
+def _build_mem0_config(vector_db: str, bucket: Optional[str] = None, region: Optional[str] = None) -> Dict:
+    """
+    Default Mem0 config for a deployment shape, built (and logged) once per process
+    
+    's3_vectors' needs the bucket and region; anything else gets the local ChromaDB store.
+    """
+    if vector_db == 's3_vectors':
+        # Use S3 Vectors for persistent storage (survives deployments). Credentials
+        # already come from the environment, where Mem0's own boto3 client picks
+        # them up; only the default region may be missing
+        os.environ.setdefault('AWS_DEFAULT_REGION', region)
+        logger.info("[Mem0] S3 vectors configured: bucket=%s index=%s region=%s", bucket, _DEFAULT_S3_INDEX, region)
+        return _s3_vectors_config(bucket, region, _DEFAULT_S3_INDEX)
+    
+    # Fallback to ChromaDB with persistent directory. The S3 index is fixed at
+    # OpenAI's 1536 dimensions, so a local embedding model is only offered here
+    chroma_persist_path = _chroma_persist_path()
+    embedder_model = _local_embedder_model()
+    logger.info("[Mem0] ChromaDB configured: path=%s embedder=%s", chroma_persist_path, embedder_model or "default")
+    return _chroma_config(chroma_persist_path, embedder_model)
+
+
+# Characters removed from user ids in a single str.translate pass
+_USER_ID_STRIP_TABLE = str.maketrans('', '', ' \t\n\r\v\f')
+
+
+@functools.lru_cache(maxsize=1)
+def _aws_session():
+    """
+    Process-wide boto3 session
+    
+    Credentials are resolved once through the default provider chain (environment,
+    shared config, container/instance role) and refreshed by botocore when they expire,
+    so clients built from this session never repeat the IMDS/STS lookup.
+    """
+    import boto3
+    return boto3.Session()
+
+
+@functools.lru_cache(maxsize=4)
+def _s3vectors_client(region: str):
+    """Shared S3 Vectors client per region, built from the process-wide session"""
+    from botocore.config import Config
+    return _aws_session().client(
+        's3vectors',
+        region_name=region,
+        config=Config(
+            max_pool_connections=50,
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'max_attempts': 3},
+            connect_timeout=2,
+            read_timeout=10
+        )
+    )
+
+
+def _memory_list(results) -> List:
+    """Normalize a Mem0 search/get_all response (list, or dict keyed 'results'/'memories') to a list"""
+    if isinstance(results, list):
+        return results
+    if isinstance(results, dict):
+        memories = results.get('memories', []) or results.get('results', []) or []
+        # If results dict contains memory objects directly
+        if not memories and 'memory' in results:
+            memories = [results]
+        return memories
+    return []
+
+
+def _extract_memory_ids(result) -> List:
+    """
+    Pull memory ids out of a Memory.add response
+    
+    Current SDKs return {'results': [{'id': ...}, ...]}; older ones return a single
+    dict with 'id'/'memory_id' or an object with an .id attribute.
+    """
+    try:
+        return [memory_id for mem in result['results'] if isinstance(mem, dict) and (memory_id := mem.get('id'))]
+    except (TypeError, KeyError):
+        pass
+    for key in ('id', 'memory_id'):
+        try:
+            return [result[key]]
+        except (TypeError, KeyError):
+            pass
+    try:
+        return [result.id]
+    except AttributeError:
+        return []
+
+
+def _memory_text(memory) -> str:
+    """
+    Stripped text of a Mem0 hit (stored under 'memory'; some versions use 'content' or 'text')
+    
+    Anything else yields "" so callers skip it, instead of putting a repr in the prompt.
+    """
+    if isinstance(memory, dict):
+        text = memory.get('memory') or memory.get('content') or memory.get('text')
+        return text.strip() if isinstance(text, str) else ''
+    if isinstance(memory, str):
+        return memory.strip()
+    return ''
+
+
+def _memory_id(memory: Dict) -> Optional[str]:
+    """Stable identifier of a Mem0 search hit (newer SDKs use 'id', older ones 'memory_id')"""
+    return memory.get('id') or memory.get('memory_id')
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment, falling back to `default` if unset or invalid"""
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("[Mem0] Ignoring %s=%r (not an integer); using %d", name, raw, default)
+        return default
 
 
 class Mem0Service:
     """Service for interacting with Mem0 for memory and context management"""
     
-    def __init__(self, vector_db: Optional[str] = None, config: Optional[Dict] = None):
+    __slots__ = (
+        'available', '_memory', '_memory_lock', '_init_args',
+        '_ctx_cache', '_ctx_refreshing', '_search_cache', '_uid_cache', '_pool', '_io_pool', '_call_limit', '_use_multi_query'
+    )
+    
+    # Combined context strings are fresh for CONTEXT_CACHE_TTL seconds, then served stale
+    # (while reloading in the background) for as long again; add_memory/delete_memory
+    # drop the user's entry immediately
+    CONTEXT_CACHE_TTL = 30.0
+    CONTEXT_CACHE_SIZE = 1024
+    # search_memories results are reused for SEARCH_CACHE_TTL seconds per user, so the
+    # same (query, limit) asked twice in one turn costs one search; writes drop them too
+    SEARCH_CACHE_TTL = 15.0
+    SEARCH_CACHE_QUERIES = 64
+    USER_ID_CACHE_SIZE = 10000
+    # Mem0/vector store calls are blocking; they run on pools owned by this service
+    # so a burst of searches cannot starve the event loop's default executor.
+    # Calls that embed (add, search) use MAX_WORKERS threads; store-only calls (get_all
+    # listings, deletes) use IO_WORKERS threads of their own, so they never queue
+    # behind embeddings. Mem0 builds its own boto3 client with botocore's default
+    # connection pool (10), which cannot be configured through Mem0, so the two pools
+    # together never exceed that size and S3 Vectors calls never find it full.
+    BOTOCORE_DEFAULT_POOL_SIZE = 10
+    IO_WORKERS = 4
+    MAX_WORKERS = min(8, os.cpu_count() or 4, BOTOCORE_DEFAULT_POOL_SIZE - IO_WORKERS)
+    # Mem0 calls allowed in flight at once. Embeddings are remote (OpenAI) by default,
+    # so this matches the pool; set MEM0_CONCURRENCY=1 with a local embedding model,
+    # which already uses every core per call and thrashes when run concurrently.
+    MAX_CONCURRENT_CALLS = _env_positive_int("MEM0_CONCURRENCY", MAX_WORKERS)
+    # Shorter texts/queries are skipped instead of paying for an embedding + round trip
+    MIN_MEMORY_CHARS = 3
+    MIN_QUERY_CHARS = 2
+    # get_all_memories stops collecting once it has this many memories, or once the
+    # next one would push the combined context past MAX_CONTEXT_CHARS (it feeds a prompt)
+    MAX_CONTEXT_MEMORIES = 50
+    MAX_CONTEXT_CHARS = 60_000
+    # Semantic queries used to assemble a user's context when Memory.get_all is
+    # unavailable (there is no "match all" query on an ANN index)
+    CONTEXT_QUERIES = (
+        "brand company business products services website",
+        "website content scraped homepage about",
+        "user background profession skills experience education",
+        "documents uploaded content context",
+        "competitors competitive analysis market",
+    )
+    # Single query covering the same themes; one embedding and one index search
+    # instead of five largely overlapping ones
+    BROAD_CONTEXT_QUERY = (
+        "brand company business products services website content "
+        "user background profession skills experience "
+        "documents uploaded content competitors market"
+    )
+    # Set MEM0_MULTI_QUERY=1 to run CONTEXT_QUERIES instead of BROAD_CONTEXT_QUERY:
+    # five embeddings and searches per context load, for more diverse memories
+    MULTI_QUERY_CONTEXT = os.getenv("MEM0_MULTI_QUERY", "").lower() in ("1", "true", "yes")
+    
+    def __init__(
+        self,
+        vector_db: Optional[str] = None,
+        config: Optional[Dict] = None,
+        multi_query: Optional[bool] = None
+    ):
         """
         Initialize Mem0 service with persistent storage
         
         Args:
             vector_db: Vector database type (e.g., 's3_vectors', 'chroma', 'pinecone')
             config: Optional Mem0 configuration dict
+            multi_query: Use CONTEXT_QUERIES for the get_all fallback
+                (defaults to MULTI_QUERY_CONTEXT)
         """
         self.available = False
+        self._memory = None
+        self._memory_lock = threading.Lock()
+        self._init_args = ()
+        self._ctx_cache = TTLCache(maxsize=self.CONTEXT_CACHE_SIZE, ttl=2 * self.CONTEXT_CACHE_TTL)
+        self._search_cache = TTLCache(maxsize=self.CONTEXT_CACHE_SIZE, ttl=self.SEARCH_CACHE_TTL)
+        self._ctx_refreshing: Dict[str, asyncio.Task] = {}
+        self._uid_cache: Dict[str, str] = {}
+        self._pool = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="mem0")
+        self._io_pool = ThreadPoolExecutor(max_workers=self.IO_WORKERS, thread_name_prefix="mem0-io")
+        self._call_limit = asyncio.Semaphore(self.MAX_CONCURRENT_CALLS)
+        self._use_multi_query = self.MULTI_QUERY_CONTEXT if multi_query is None else multi_query
         
         if not MEM0_AVAILABLE:
-            print("[Mem0] SDK not available. Install with: pip install mem0ai")
+            logger.warning("[Mem0] SDK not available. Install with: pip install mem0ai")
             return
         
         try:
-            import os
-            from pathlib import Path
-            
             # Check for AWS credentials for S3 vector storage (persistent across deployments)
             aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
             aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
@@ -49,180 +418,188 @@ class Mem0Service:
             if vector_db is None:
                 if aws_access_key and aws_secret_key and aws_bucket:
                     vector_db = 's3_vectors'
-                    print("[Mem0] Using S3 vectors for persistent storage (survives deployments)")
+                    logger.info("[Mem0] Using S3 vectors for persistent storage (survives deployments)")
                 else:
                     vector_db = 'chroma'
-                    print("[Mem0] Using ChromaDB (local) - AWS credentials not configured for S3 vectors")
-                    print("[Mem0] WARNING: Local ChromaDB will be lost on deployment. Configure AWS for persistent storage.")
+                    logger.warning(
+                        "[Mem0] Using ChromaDB (local) - AWS credentials not configured for S3 vectors. "
+                        "Local ChromaDB will be lost on deployment."
+                    )
             
-            mem0_config = config or {}
+            mem0_config = config
+            index_name = None
             
-            # Configure based on vector_db type
+            # Configure based on vector_db type (S3 Vectors only with full AWS credentials)
             if not mem0_config:
                 if vector_db == 's3_vectors' and aws_access_key and aws_secret_key and aws_bucket:
-                    # Use S3 Vectors for persistent storage (survives deployments)
-                    # AWS credentials should be set via environment variables
-                    # Index names must be lowercase, alphanumeric, 3-63 chars
-                    index_name = "mem0memories"
-                    
-                    # Ensure AWS credentials are in environment for Mem0/boto3 to use
-                    os.environ['AWS_ACCESS_KEY_ID'] = aws_access_key
-                    os.environ['AWS_SECRET_ACCESS_KEY'] = aws_secret_key
-                    os.environ['AWS_DEFAULT_REGION'] = aws_region
-                    
-                    mem0_config = {
-                        "vector_store": {
-                            "provider": "s3_vectors",
-                            "config": {
-                                "vector_bucket_name": aws_bucket,
-                                "collection_name": index_name,
-                                "embedding_model_dims": 1536,  # OpenAI embedding dimensions
-                                "distance_metric": "cosine",
-                                "region_name": aws_region
-                            }
-                        }
-                    }
-                    print(f"[Mem0] Configuring S3 vectors with bucket: {aws_bucket}, index: {index_name}, region: {aws_region}")
-                    print(f"[Mem0] AWS credentials configured in environment")
+                    index_name = _DEFAULT_S3_INDEX
+                    mem0_config = _build_mem0_config('s3_vectors', aws_bucket, aws_region)
                 else:
-                    # Fallback to ChromaDB with persistent directory
-                    backend_dir = Path(__file__).parent.parent
-                    chroma_persist_dir = backend_dir / "chroma_db"
-                    chroma_persist_dir.mkdir(exist_ok=True)
-                    chroma_persist_path = str(chroma_persist_dir.absolute())
-                    
-                    mem0_config = {
-                        "vector_store": {
-                            "provider": "chroma",
-                            "config": {
-                                "collection_name": "mem0_memories",
-                                "path": chroma_persist_path,
-                                "persist_directory": chroma_persist_path
-                            }
-                        }
-                    }
-                    print(f"[Mem0] Configuring ChromaDB with persistent storage: {chroma_persist_path}")
-                    print("[Mem0] NOTE: For production, configure AWS credentials to use S3 vectors (persistent across deployments)")
-            
-            # Initialize Mem0 with config
-            try:
-                print(f"[Mem0] Initializing with config: {mem0_config}")
-                self.memory = Memory.from_config(mem0_config)
-                print(f"[Mem0] SUCCESS: Initialized with config")
-            except Exception as config_error:
-                # If S3 failed with invalid index name, try alternative index names
-                if vector_db == 's3_vectors' and "Invalid index name" in str(config_error):
-                    print(f"[Mem0] WARNING: Index name '{index_name}' invalid, trying alternatives...")
-                    
-                    # Try alternative index names (S3 Vectors naming rules: lowercase, no underscores, 3-63 chars)
-                    alternative_indexes = ["memories", "mem0memories", "mem0index", "vectorindex"]
-                    
-                    for alt_index in alternative_indexes:
-                        try:
-                            print(f"[Mem0] Trying index name: {alt_index}")
-                            alt_config = {
-                                "vector_store": {
-                                    "provider": "s3_vectors",
-                                    "config": {
-                                        "vector_bucket_name": aws_bucket,
-                                        "collection_name": alt_index,
-                                        "embedding_model_dims": 1536,
-                                        "distance_metric": "cosine",
-                                        "region_name": aws_region
-                                    }
-                                }
-                            }
-                            self.memory = Memory.from_config(alt_config)
-                            print(f"[Mem0] SUCCESS: Initialized with index: {alt_index}")
-                            mem0_config = alt_config  # Update for logging
-                            break
-                        except Exception as alt_error:
-                            if "Invalid index name" not in str(alt_error):
-                                # Different error - might be progress
-                                print(f"[Mem0] Index {alt_index} failed with different error: {alt_error}")
-                            continue
-                    else:
-                        # All alternative indexes failed
-                        print(f"[Mem0] ERROR: All index name attempts failed")
-                        raise config_error
-                else:
-                    # Other error or not S3 - try fallback
-                    print(f"[Mem0] WARNING: Config initialization failed: {config_error}")
-                    import traceback
-                    traceback.print_exc()
-                    
-                    # If S3 was requested but failed, this is a problem
-                    if vector_db == 's3_vectors':
-                        print(f"[Mem0] CRITICAL ERROR: S3 vector initialization failed! Memories will NOT persist.")
-                        print(f"[Mem0] Check: AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_S3_BUCKET, AWS_REGION")
-                        print(f"[Mem0] Bucket name: {aws_bucket}")
-                        print(f"[Mem0] Region: {aws_region}")
-                        print(f"[Mem0] Access key set: {bool(aws_access_key)}")
-                        print(f"[Mem0] Secret key set: {bool(aws_secret_key)}")
-                        
-                        # Fallback to ChromaDB if S3 completely fails
-                        print(f"[Mem0] WARNING: Falling back to ChromaDB (memories will NOT persist across restarts)")
-                        backend_dir = Path(__file__).parent.parent
-                        chroma_persist_dir = backend_dir / "chroma_db"
-                        chroma_persist_dir.mkdir(exist_ok=True)
-                        chroma_persist_path = str(chroma_persist_dir.absolute())
-                        os.environ['CHROMA_PERSIST_DIRECTORY'] = chroma_persist_path
-                        self.memory = Memory()
-                        vector_db = 'chroma'  # Update for logging
-                    elif vector_db == 'chroma':
-                        backend_dir = Path(__file__).parent.parent
-                        chroma_persist_dir = backend_dir / "chroma_db"
-                        chroma_persist_dir.mkdir(exist_ok=True)
-                        chroma_persist_path = str(chroma_persist_dir.absolute())
-                        os.environ['CHROMA_PERSIST_DIRECTORY'] = chroma_persist_path
-                        print(f"[Mem0] Falling back to ChromaDB at: {chroma_persist_path}")
-                        self.memory = Memory()
-                    else:
-                        self.memory = Memory()
-                        print(f"[Mem0] WARNING: Using fallback initialization - persistence may be limited")
+                    mem0_config = _build_mem0_config('chroma')
             
+            self._init_args = (
+                mem0_config, vector_db, index_name, aws_bucket, aws_region, aws_access_key, aws_secret_key
+            )
             self.available = True
-            storage_type = "S3 (persistent)" if vector_db == 's3_vectors' else "ChromaDB (local)"
-            print(f"[Mem0] OK Mem0 service initialized with {storage_type} storage")
-            if vector_db == 's3_vectors':
-                print(f"[Mem0] SUCCESS: Memories will persist across deployments and restarts")
+            logger.info("[Mem0] Configured %s storage; Memory is created on first use", vector_db)
             
-            # Verify S3 Vectors connection if using S3 vectors
-            if vector_db == 's3_vectors' and self.available:
-                try:
-                    # Try to verify S3 Vectors access
-                    import boto3
-                    # S3 Vectors uses a different service endpoint
-                    try:
-                        s3vectors_client = boto3.client(
-                            's3vectors',
-                            aws_access_key_id=aws_access_key,
-                            aws_secret_access_key=aws_secret_key,
-                            region_name=aws_region
-                        )
-                        # Try to list vector buckets to verify access
-                        response = s3vectors_client.list_vector_buckets()
-                        print(f"[Mem0] SUCCESS: S3 Vectors access verified. Found {len(response.get('vectorBuckets', []))} vector bucket(s)")
-                    except Exception as s3v_error:
-                        if 'UnknownServiceError' in str(type(s3v_error).__name__) or 'Unknown service' in str(s3v_error):
-                            print(f"[Mem0] WARNING: S3 Vectors service not available in boto3. Using Mem0's built-in S3 Vectors support.")
-                        else:
-                            print(f"[Mem0] WARNING: Could not verify S3 Vectors access: {s3v_error}")
-                            print(f"[Mem0] Ensure IAM policy includes s3vectors:* permissions")
-                except Exception as verify_error:
-                    print(f"[Mem0] WARNING: Could not verify S3 Vectors access: {verify_error}")
-                    print(f"[Mem0] Memories may not persist correctly. Check IAM permissions (s3vectors:*).")
+            # Verify S3 Vectors connection in the background if using S3 vectors
+            # (once per bucket per process)
+            if vector_db == 's3_vectors' and (aws_bucket, aws_region) not in _VERIFIED_BUCKETS:
+                threading.Thread(
+                    target=self._verify_s3_vectors,
+                    args=(aws_bucket, aws_region),
+                    name="mem0-s3-verify",
+                    daemon=True
+                ).start()
             
         except Exception as e:
-            print(f"[Mem0] ERROR: Error initializing Mem0 service: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[Mem0] Error initializing Mem0 service: %s", e)
             self.available = False
     
+    @property
+    def memory(self) -> "Memory":
+        """
+        The Mem0 Memory instance, created on first access
+        
+        Construction opens the vector store (and may retry S3 index names), so the
+        first access should happen on a worker thread, never on the event loop.
+        """
+        memory = self._memory
+        if memory is None:
+            with self._memory_lock:
+                if self._memory is None:
+                    try:
+                        self._memory = self._create_memory(*self._init_args)
+                    except Exception:
+                        logger.exception("[Mem0] ERROR: Error initializing Mem0 memory store")
+                        self.available = False
+                        raise
+                memory = self._memory
+        return memory
+    
+    def _create_memory(
+        self,
+        mem0_config: Dict,
+        vector_db: str,
+        index_name: Optional[str],
+        aws_bucket: Optional[str],
+        aws_region: str,
+        aws_access_key: Optional[str],
+        aws_secret_key: Optional[str]
+    ) -> "Memory":
+        """Build the Memory instance from the resolved config, with the S3/ChromaDB fallbacks"""
+        try:
+            if vector_db == 's3_vectors' and index_name:
+                memory = _memory_for_s3_index(aws_bucket, aws_region, index_name)
+            else:
+                logger.debug("[Mem0] Initializing with config: %s", mem0_config)
+                memory = _memory_from_config(mem0_config)
+        except Exception as config_error:
+            # Initialization failed - fall back to a local store
+            logger.warning("[Mem0] Config initialization failed: %s", config_error, exc_info=True)
+            
+            # If S3 was requested but failed, this is a problem
+            if vector_db == 's3_vectors':
+                # Fallback to ChromaDB if S3 completely fails
+                logger.error(
+                    "[Mem0] S3 vector initialization failed (bucket=%s region=%s access_key_set=%s "
+                    "secret_key_set=%s); falling back to ChromaDB - memories will NOT persist across restarts. "
+                    "Check AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_S3_BUCKET, AWS_REGION",
+                    aws_bucket, aws_region, bool(aws_access_key), bool(aws_secret_key)
+                )
+                chroma_persist_path = _chroma_persist_path()
+                os.environ['CHROMA_PERSIST_DIRECTORY'] = chroma_persist_path
+                memory = _memory_class()()
+                vector_db = 'chroma'  # Update for logging
+            elif vector_db == 'chroma':
+                chroma_persist_path = _chroma_persist_path()
+                os.environ['CHROMA_PERSIST_DIRECTORY'] = chroma_persist_path
+                logger.warning("[Mem0] Falling back to ChromaDB at: %s", chroma_persist_path)
+                memory = _memory_class()()
+            else:
+                memory = _memory_class()()
+                logger.warning("[Mem0] Using fallback initialization - persistence may be limited")
+        
+        storage_type = "S3 (persistent)" if vector_db == 's3_vectors' else "ChromaDB (local)"
+        logger.info("[Mem0] OK Mem0 service initialized with %s storage", storage_type)
+        return memory
+    
+    def _verify_s3_vectors(self, aws_bucket: Optional[str], aws_region: str) -> None:
+        """Check S3 Vectors access and log the outcome (runs on a background thread)"""
+        try:
+            # Try to list vector buckets to verify access
+            response = _s3vectors_client(aws_region).list_vector_buckets()
+            _VERIFIED_BUCKETS.add((aws_bucket, aws_region))
+            logger.info(
+                "[Mem0] SUCCESS: S3 Vectors access verified. Found %d vector bucket(s)",
+                len(response.get('vectorBuckets', []))
+            )
+        except Exception as s3v_error:
+            if 'UnknownServiceError' in str(type(s3v_error).__name__) or 'Unknown service' in str(s3v_error):
+                logger.warning("[Mem0] S3 Vectors service not available in boto3. Using Mem0's built-in S3 Vectors support.")
+            else:
+                logger.warning(
+                    "[Mem0] Could not verify S3 Vectors access: %s. Memories may not persist correctly. "
+                    "Ensure IAM policy includes s3vectors:* permissions",
+                    s3v_error
+                )
+    
     def is_available(self) -> bool:
         """Check if Mem0 service is available"""
         return self.available
     
+    async def _run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Mem0 call on the service's thread pool (at most MAX_CONCURRENT_CALLS at once)"""
+        loop = asyncio.get_running_loop()
+        async with self._call_limit:
+            return await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+    
+    async def _run_io(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Mem0 call that does no embedding (listing, delete) on the I/O pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(fn, *args, **kwargs))
+    
+    async def warmup(self) -> bool:
+        """
+        Create the Memory instance on the worker pool ahead of the first request
+        
+        Opening the vector store can take seconds (ChromaDB index load, S3 index
+        lookup), so this lets app startup pay for it without blocking the event loop.
+        Returns whether the store is ready.
+        """
+        if not self.available:
+            return False
+        
+        try:
+            await self._run(lambda: self.memory)
+            return True
+        except Exception as e:
+            logger.warning("[Mem0] Warm-up failed: %s", e)
+            return False
+    
+    def close(self) -> None:
+        """Stop the worker pools (in-flight calls are left to finish)"""
+        self._pool.shutdown(wait=False)
+        self._io_pool.shutdown(wait=False)
+    
+    async def _add(self, normalized_user_id: str, text: str, metadata: Dict):
+        """Write one message with Memory.add and return Mem0's result"""
+        # Round-trip non-primitive values (datetimes, numpy scalars, nested objects) through
+        # the JSON encoder so the vector store receives plain JSON types
+        if not all(isinstance(value, _PRIMITIVE_TYPES) for value in metadata.values()):
+            metadata = fast_json.loads(fast_json.dumps(metadata))
+        
+        def add_sync():
+            # Mem0 uses agent_id to scope memories per user
+            return self.memory.add(
+                messages=[{"role": "user", "content": text}],
+                agent_id=normalized_user_id,
+                metadata=metadata
+            )
+        
+        return await self._run(add_sync)
+    
     def _normalize_user_id(self, user_id: str) -> str:
         """
         Normalize user ID for consistency with Mem0 agent_id
@@ -231,12 +608,25 @@ class Mem0Service:
         """
         if not user_id:
             return "anonymous_user"
+        cached = self._uid_cache.get(user_id)
+        if cached is not None:
+            return cached
         # Normalize: lowercase, strip whitespace, ensure it's an email format
         normalized = user_id.lower().strip()
         # Remove any extra whitespace or special characters that might cause issues
-        normalized = normalized.replace(' ', '').replace('\n', '').replace('\t', '')
+        normalized = normalized.translate(_USER_ID_STRIP_TABLE)
+        # Intern so every lookup for the same user shares one string object
+        normalized = sys.intern(normalized)
+        if len(self._uid_cache) >= self.USER_ID_CACHE_SIZE:
+            self._uid_cache.clear()
+        self._uid_cache[user_id] = normalized
         return normalized
     
+    def _invalidate(self, normalized_user_id: str) -> None:
+        """Drop a user's cached context and search results after a write"""
+        self._ctx_cache.pop(normalized_user_id)
+        self._search_cache.pop(normalized_user_id)
+    
     async def add_memory(
         self,
         user_id: str,
@@ -255,71 +645,119 @@ class Mem0Service:
             Dict with memory info (id, created_at) or None if failed
         """
         if not self.available:
-            print("[Mem0] Service not available for adding memory")
+            logger.warning("[Mem0] Service not available for adding memory")
+            return None
+        
+        # Nothing worth an embedding call and a vector store write
+        text = (text or "").strip()
+        if len(text) < self.MIN_MEMORY_CHARS:
             return None
         
         try:
             # Normalize user_id for consistency
             normalized_user_id = self._normalize_user_id(user_id)
             
-            def add_sync():
-                # Mem0 uses agent_id to scope memories per user
-                result = self.memory.add(
-                    messages=[{"role": "user", "content": text}],
-                    agent_id=normalized_user_id,  # Use normalized ID
-                    metadata=metadata or {}
-                )
-                return result
+            result = await self._add(normalized_user_id, text, metadata or {})
+            self._invalidate(normalized_user_id)
             
-            result = await asyncio.to_thread(add_sync)
+            # One clock read serves both the timestamp and the fallback id
+            added_ns = time.time_ns()
+            added_at = datetime.fromtimestamp(added_ns / 1e9).isoformat()
             
-            # Mem0 returns a dict with 'results' array containing memory objects
-            memory_ids = []
-            if isinstance(result, dict):
-                # Check for results array (Mem0 format)
-                if 'results' in result and isinstance(result['results'], list):
-                    memory_ids = [mem.get('id') for mem in result['results'] if isinstance(mem, dict) and 'id' in mem]
-                    if memory_ids:
-                        print(f"[Mem0] OK Memory added for user {normalized_user_id}: {len(memory_ids)} memories created (first ID: {memory_ids[0]})")
-                # Fallback: check for direct id
-                elif 'id' in result:
-                    memory_ids = [result['id']]
-                elif 'memory_id' in result:
-                    memory_ids = [result['memory_id']]
-            elif hasattr(result, 'id'):
-                memory_ids = [result.id]
+            memory_ids = _extract_memory_ids(result)
             
             # Use first memory ID or generate fallback
             if memory_ids:
                 memory_id = memory_ids[0]
-                print(f"[Mem0] OK Memory ID: {memory_id} for user {normalized_user_id}")
+                logger.info(
+                    "[Mem0] OK Memory added for user %s: %d memories created (first ID: %s)",
+                    normalized_user_id, len(memory_ids), memory_id
+                )
                 return {
                     'resource_id': str(memory_id),
                     'user_id': normalized_user_id,
-                    'added_at': datetime.now().isoformat(),
-                    'text_preview': text[:100] + "..." if len(text) > 100 else text,
+                    'added_at': added_at,
+                    'text_preview': text if len(text) <= 100 else f"{text[:100]}...",
                     'verified': True,
                     'all_memory_ids': memory_ids  # Include all IDs if multiple were created
                 }
             else:
                 # Generate fallback ID
-                fallback_id = f"mem0_{datetime.now().timestamp()}"
-                print(f"[Mem0] WARNING: Memory added but no ID in expected format. Result type: {type(result)}")
-                if isinstance(result, dict):
-                    print(f"[Mem0] Result keys: {list(result.keys())}")
-                print(f"[Mem0] Using fallback ID: {fallback_id}")
+                fallback_id = f"mem0_{added_ns}"
+                logger.warning(
+                    "[Mem0] Memory added but no ID in expected format (result type %s, keys %s); using fallback ID %s",
+                    type(result).__name__, list(result.keys()) if isinstance(result, dict) else None, fallback_id
+                )
                 return {
                     'resource_id': fallback_id,
                     'user_id': normalized_user_id,
-                    'added_at': datetime.now().isoformat(),
+                    'added_at': added_at,
                     'verified': False
                 }
                 
-        except Exception as e:
-            print(f"[Mem0] ERROR: Error adding memory: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("[Mem0] Error adding memory for user %s", user_id)
+            return None
+    
+    async def add_memories_bulk(
+        self,
+        user_id: str,
+        texts: List[str],
+        metadata: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Add several memories for one user, writing them concurrently
+        
+        Each text is its own Memory.add call; one failed write does not stop the others.
+        
+        Args:
+            user_id: User identifier (email)
+            texts: Text contents to store (blank or trivially short entries are skipped)
+            metadata: Optional metadata dictionary applied to every text
+            
+        Returns:
+            Dict with the number of texts stored and the created memory ids,
+            or None if nothing was added
+        """
+        if not self.available:
+            logger.warning("[Mem0] Service not available for adding memories")
+            return None
+        
+        texts = [text for text in (t.strip() for t in texts if t) if len(text) >= self.MIN_MEMORY_CHARS]
+        if not texts:
+            return None
+        
+        normalized_user_id = self._normalize_user_id(user_id)
+        results = await asyncio.gather(
+            *(self._add(normalized_user_id, text, metadata or {}) for text in texts),
+            return_exceptions=True
+        )
+        self._invalidate(normalized_user_id)
+        
+        stored = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("[Mem0] Error adding memory for user %s: %s", normalized_user_id, result)
+            else:
+                stored.append(result)
+        if not stored:
             return None
+        
+        # Mem0 may return the same id for texts it merged into one memory
+        memory_ids = list(dict.fromkeys(
+            memory_id for result in stored for memory_id in _extract_memory_ids(result)
+        ))
+        logger.info(
+            "[Mem0] OK %d of %d texts added for user %s: %d memories created",
+            len(stored), len(texts), normalized_user_id, len(memory_ids)
+        )
+        return {
+            'user_id': normalized_user_id,
+            'added_at': datetime.now().isoformat(),
+            'count': len(stored),
+            'verified': bool(memory_ids),
+            'all_memory_ids': memory_ids
+        }
     
     async def search_memories(
         self,
@@ -339,11 +777,29 @@ class Mem0Service:
             Dict with search results (memories, answer) or None if failed
         """
         if not self.available:
-            print("[Mem0] Service not available for searching memories")
+            logger.warning("[Mem0] Service not available for searching memories")
             return None
         
         # Normalize user_id for consistency (Mem0 uses agent_id)
-        normalized_user_id = self._normalize_user_id(user_id)
+        return await self._search(self._normalize_user_id(user_id), query, limit)
+    
+    async def _search(self, normalized_user_id: str, query: str, limit: int) -> Optional[Dict]:
+        """search_memories for an already-normalized user id"""
+        # A blank query would still cost an embedding call and an index search
+        if len(query.strip()) < self.MIN_QUERY_CHARS:
+            return {'query': query, 'answer': "", 'memories': [], 'count': 0, 'user_id': normalized_user_id}
+        
+        # Results for this user, keyed by (query, limit). A new dict is registered before
+        # searching, so a write during the search orphans it instead of caching stale hits.
+        cached = self._search_cache.get(normalized_user_id)
+        if cached is None:
+            cached = {}
+            self._search_cache.set(normalized_user_id, cached)
+        else:
+            hit = cached.get((query, limit))
+            if hit is not None:
+                # Callers get their own copy, so changing it cannot alter later hits
+                return copy.deepcopy(hit)
         
         try:
             def search_sync():
@@ -355,55 +811,37 @@ class Mem0Service:
                 )
                 return results
             
-            results = await asyncio.to_thread(search_sync)
+            results = await self._run(search_sync)
             
             # Format results - Mem0 returns list or dict
-            memories = []
-            if isinstance(results, list):
-                memories = results
-            elif isinstance(results, dict):
-                # Check different possible keys
-                memories = results.get('memories', []) or results.get('results', []) or []
-                # If results dict contains memory objects directly
-                if not memories and 'memory' in results:
-                    memories = [results]
+            memories = _memory_list(results)
             
             # Extract and format memory content
-            answer_parts = []
-            for memory in memories:
-                if isinstance(memory, dict):
-                    # Extract memory content (Mem0 stores in 'memory' field)
-                    content = memory.get('memory', '') or memory.get('content', '') or str(memory)
-                    if content and content.strip():
-                        answer_parts.append(content.strip())
-                else:
-                    content = str(memory).strip()
-                    if content:
-                        answer_parts.append(content)
-            
-            answer = "\n\n".join(answer_parts) if answer_parts else ""
+            answer = "\n\n".join(content for content in map(_memory_text, memories) if content)
             
             if memories:
-                print(f"[Mem0] Found {len(memories)} relevant memories for user {normalized_user_id} (query: '{query[:50]}...')")
+                logger.debug("[Mem0] Found %d relevant memories for user %s (query: %.50r)", len(memories), normalized_user_id, query)
             
-            return {
+            result = {
                 'query': query,
                 'answer': answer,
                 'memories': memories,
                 'count': len(memories),
                 'user_id': normalized_user_id
             }
+            if len(cached) >= self.SEARCH_CACHE_QUERIES:
+                cached.clear()
+            cached[(query, limit)] = copy.deepcopy(result)
+            return result
             
-        except Exception as e:
-            print(f"[Mem0] ERROR: Error searching memories for user {normalized_user_id}: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("[Mem0] Error searching memories for user %s", normalized_user_id)
             return None
     
     async def get_all_memories(self, user_id: str) -> str:
         """
         Get all memories for a user as a single context string
-        Uses multiple query strategies to retrieve comprehensive context
+        Lists the user's memories with Memory.get_all (semantic queries on older SDKs)
         
         Args:
             user_id: User identifier (normalized to lowercase)
@@ -417,62 +855,129 @@ class Mem0Service:
         # Normalize user_id for consistency
         normalized_user_id = self._normalize_user_id(user_id)
         
+        # Stale-while-revalidate: fresh entries are returned as-is; stale ones are
+        # returned immediately while a background task reloads them
+        cached = self._ctx_cache.get(normalized_user_id)
+        if cached is not None:
+            fetched_at, context = cached
+            if (time.monotonic() - fetched_at >= self.CONTEXT_CACHE_TTL
+                    and normalized_user_id not in self._ctx_refreshing):
+                self._ctx_refreshing[normalized_user_id] = asyncio.get_running_loop().create_task(
+                    self._refresh_context(normalized_user_id, cached)
+                )
+            return context
+        
+        return await self._load_context(normalized_user_id)
+    
+    async def _refresh_context(self, normalized_user_id: str, stale_entry: tuple) -> None:
+        """Background reload of a stale context cache entry"""
         try:
-            # Strategy: Use multiple semantic queries to get diverse memories
-            queries = [
-                "brand company business products services website",
-                "website content scraped homepage about",
-                "user background profession skills experience education",
-                "documents uploaded content context",
-                "competitors competitive analysis market",
-                "*"  # Fallback: try to get all
-            ]
-            
-            all_memories = []
+            await self._load_context(normalized_user_id, replacing=stale_entry)
+        finally:
+            self._ctx_refreshing.pop(normalized_user_id, None)
+    
+    async def _load_context(self, normalized_user_id: str, replacing: Optional[tuple] = None) -> str:
+        """
+        Build a user's combined context string and cache it
+        
+        When `replacing` is given, the result is only stored if that entry is still the
+        cached one, so a refresh never resurrects context invalidated by add/delete.
+        """
+        try:
+            # Stripped memory texts, deduplicated by id and by content (the same text
+            # can come back under different ids, or with no id at all)
+            context_parts = []
             seen_ids = set()
+            seen_hashes = set()
+            # Characters left for the joined context (each part after the first costs
+            # two more for its separator)
+            budget = self.MAX_CONTEXT_CHARS + 2
+            
+            def merge(memories: List) -> bool:
+                """Add new memories in order; return False once the char budget is spent"""
+                nonlocal budget
+                for mem in memories:
+                    if not isinstance(mem, dict):
+                        continue
+                    mem_id = _memory_id(mem)
+                    if mem_id and mem_id in seen_ids:
+                        continue
+                    content = _memory_text(mem)
+                    if not content:
+                        continue
+                    digest = hashlib.blake2b(content.lower().encode(), digest_size=8).digest()
+                    if digest in seen_hashes:
+                        continue
+                    if len(content) + 2 > budget:
+                        return False
+                    budget -= len(content) + 2
+                    if mem_id:
+                        seen_ids.add(mem_id)
+                    seen_hashes.add(digest)
+                    context_parts.append(content)
+                return True
             
-            for query in queries:
-                try:
-                    results = await self.search_memories(normalized_user_id, query, limit=25)
+            # List the user's memories directly: a metadata filter on agent_id, with no
+            # embedding or similarity search, and no memories missed by query wording
+            def list_sync():
+                get_all = getattr(self.memory, 'get_all', None)
+                if get_all is None:
+                    return None
+                return get_all(agent_id=normalized_user_id, limit=self.MAX_CONTEXT_MEMORIES)
+            
+            listed = None
+            try:
+                listed = await self._run_io(list_sync)
+            except Exception as e:
+                logger.warning("[Mem0] get_all failed, using semantic queries instead: %s", e)
+            
+            if listed is not None:
+                merge(_memory_list(listed))
+            else:
+                # Fallback for SDKs without get_all: semantic search - one broad query
+                # by default, or the narrower CONTEXT_QUERIES when multi_query is enabled
+                if self._use_multi_query:
+                    queries, per_query_limit = self.CONTEXT_QUERIES, 25
+                else:
+                    queries, per_query_limit = (self.BROAD_CONTEXT_QUERY,), self.MAX_CONTEXT_MEMORIES
+                # The searches are independent, so run them concurrently on the thread pool
+                # and merge afterwards in query order
+                results_list = await asyncio.gather(
+                    *(self._search(normalized_user_id, query, per_query_limit) for query in queries),
+                    return_exceptions=True
+                )
+                
+                for query, results in zip(queries, results_list):
+                    if isinstance(results, Exception):
+                        logger.warning("[Mem0] Query %r failed: %s", query, results)
+                        continue
                     
-                    if results and results.get('memories'):
-                        memories = results['memories']
-                        for mem in memories:
-                            if isinstance(mem, dict):
-                                mem_id = mem.get('id') or mem.get('memory_id')
-                                if mem_id and mem_id not in seen_ids:
-                                    seen_ids.add(mem_id)
-                                    all_memories.append(mem)
+                    if results and results.get('memories') and not merge(results['memories']):
+                        break
                     
                     # If we got results, we have enough context
-                    if len(all_memories) >= 50:
+                    if len(context_parts) >= self.MAX_CONTEXT_MEMORIES:
                         break
-                        
-                except Exception as e:
-                    print(f"[Mem0] Query '{query}' failed: {e}")
-                    continue
             
             # Format all memories into context string
-            if all_memories:
-                context_parts = []
-                for mem in all_memories:
-                    if isinstance(mem, dict):
-                        content = mem.get('memory', '') or mem.get('content', '') or str(mem)
-                        if content and content.strip():
-                            context_parts.append(content.strip())
-                
+            context = ""
+            if context_parts:
+                # Parts are already stripped, so the joined string needs no second strip/scan
                 combined_context = "\n\n".join(context_parts)
                 
-                if combined_context and len(combined_context.strip()) > 10:
-                    print(f"[Mem0] OK Retrieved {len(all_memories)} unique memories for user {normalized_user_id} ({len(combined_context)} chars)")
-                    return combined_context
+                if len(combined_context) > 10:
+                    logger.info(
+                        "[Mem0] OK Retrieved %d unique memories for user %s (%d chars)",
+                        len(context_parts), normalized_user_id, len(combined_context)
+                    )
+                    context = combined_context
             
-            return ""
+            if replacing is None or self._ctx_cache.get(normalized_user_id) is replacing:
+                self._ctx_cache.set(normalized_user_id, (time.monotonic(), context))
+            return context
             
-        except Exception as e:
-            print(f"[Mem0] ERROR: Error getting all memories: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("[Mem0] Error getting all memories for user %s", normalized_user_id)
             return ""
     
     async def delete_memory(self, user_id: str, memory_id: str) -> bool:
@@ -489,15 +994,33 @@ class Mem0Service:
         if not self.available:
             return False
         
+        # Memories are scoped by the normalized id (as in add_memory), never the raw one
+        normalized_user_id = self._normalize_user_id(user_id)
         try:
             def delete_sync():
-                self.memory.delete(memory_id=memory_id, agent_id=user_id)
+                self.memory.delete(memory_id=memory_id, agent_id=normalized_user_id)
             
-            await asyncio.to_thread(delete_sync)
-            print(f"[Mem0] OK Memory deleted: {memory_id}")
+            await self._run_io(delete_sync)
+            self._invalidate(normalized_user_id)
+            logger.info("[Mem0] OK Memory deleted: %s", memory_id)
             return True
             
         except Exception as e:
-            print(f"[Mem0] ERROR: Error deleting memory: {e}")
+            logger.warning("[Mem0] Error deleting memory %s: %s", memory_id, e)
             return False
 
+
+# One Mem0Service per process: its worker pools and caches are shared
+# by every caller (each gunicorn/uvicorn worker process still gets its own)
+_service: Optional[Mem0Service] = None
+_service_lock = threading.Lock()
+
+
+def get_mem0_service() -> Mem0Service:
+    """Return the process-wide Mem0Service, creating it on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = Mem0Service()
+    return _service
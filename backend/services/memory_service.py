@@ -3,11 +3,14 @@ Unified Memory Service - Combines S3 (documents) + Mem0 (memory)
 Drop-in replacement for HyperspellService
 """
 
-from typing import Optional, Dict
-from services.s3_service import S3Service
-from services.mem0_service import Mem0Service
+from typing import Optional, Dict, List
 from datetime import datetime
+from services.s3_service import get_s3_service
+from services.mem0_service import get_mem0_service
 import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class MemoryService:
@@ -18,8 +21,9 @@ class MemoryService:
     
     def __init__(self):
         """Initialize both S3 and Mem0 services"""
-        self.s3_service = S3Service()
-        self.mem0_service = Mem0Service()
+        # Process-wide instances, shared with any other MemoryService
+        self.s3_service = get_s3_service()
+        self.mem0_service = get_mem0_service()
         
         # Service is available if at least S3 works (Mem0 may fail but S3 can still store documents)
         s3_available = self.s3_service.is_available()
@@ -34,14 +38,18 @@ class MemoryService:
                 status.append("Mem0")
             else:
                 status.append("Mem0 (unavailable)")
-            print(f"[Memory] OK Unified memory service initialized ({' + '.join(status)})")
+            logger.info("[Memory] OK Unified memory service initialized (%s)", " + ".join(status))
         else:
-            print("[Memory] WARNING: Neither S3 nor Mem0 available. Check configuration.")
+            logger.warning("[Memory] Neither S3 nor Mem0 available. Check configuration.")
     
     def is_available(self) -> bool:
         """Check if service is available"""
         return self.available
     
+    async def aensure_ready(self) -> bool:
+        """Open the Mem0 vector store off the event loop so the first memory call does not pay for it"""
+        return await self.mem0_service.warmup()
+    
     # Document storage methods (using S3)
     async def upload_document(
         self,
@@ -61,7 +69,7 @@ class MemoryService:
             Dict with upload info (resource_id, filename) or None if failed
         """
         if not self.s3_service.is_available():
-            print("[Memory] S3 service not available for document upload")
+            logger.warning("[Memory] S3 service not available for document upload")
             return None
         
         try:
@@ -86,7 +94,7 @@ class MemoryService:
             return None
             
         except Exception as e:
-            print(f"[Memory] ERROR: Error uploading document: {e}")
+            logger.error("[Memory] ERROR: Error uploading document: %s", e)
             return None
     
     # Memory management methods (using Mem0)
@@ -108,7 +116,7 @@ class MemoryService:
             Dict with memory info (resource_id) or None if failed
         """
         if not self.mem0_service.is_available():
-            print("[Memory] Mem0 service not available for adding memory")
+            logger.warning("[Memory] Mem0 service not available for adding memory")
             return None
         
         metadata = {}
@@ -117,6 +125,33 @@ class MemoryService:
         
         return await self.mem0_service.add_memory(user_id, text, metadata)
     
+    async def add_text_memories(
+        self,
+        user_id: str,
+        texts: List[str],
+        collection: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Add several text memories to Mem0 at once (written concurrently)
+        
+        Args:
+            user_id: User identifier
+            texts: Text contents
+            collection: Collection name (stored as metadata)
+            
+        Returns:
+            Dict with the number of texts stored ('count') or None if nothing was added
+        """
+        if not self.mem0_service.is_available():
+            logger.warning("[Memory] Mem0 service not available for adding memories")
+            return None
+        
+        metadata = {}
+        if collection:
+            metadata['collection'] = collection
+        
+        return await self.mem0_service.add_memories_bulk(user_id, texts, metadata)
+    
     async def query_memories(
         self,
         user_id: str,
@@ -135,7 +170,7 @@ class MemoryService:
             Dict with query results (answer, memories) or None if failed
         """
         if not self.mem0_service.is_available():
-            print("[Memory] Mem0 service not available for querying")
+            logger.warning("[Memory] Mem0 service not available for querying")
             return None
         
         return await self.mem0_service.search_memories(user_id, query, max_results)
@@ -173,41 +208,29 @@ class MemoryService:
             Dict with memory info (resource_id) or None if failed
         """
         if not self.mem0_service.is_available():
-            print("[Memory] Mem0 service not available")
+            logger.warning("[Memory] Mem0 service not available")
             return None
         
         try:
-            # Get existing context
-            existing_context = await self.get_all_memories_context(user_id)
-            
-            # Prepare new content section
-            timestamp = datetime.now().isoformat()
-            new_content_section = f"\n\n--- {content_type.upper()} ADDED: {timestamp} ---\n{new_content}\n"
-            
-            # Merge existing and new content
-            if existing_context and len(existing_context.strip()) > 10:
-                unified_content = existing_context + new_content_section
-            else:
-                unified_content = f"BRAND CONTEXT - UNIFIED MEMORY\n{new_content_section}"
-            
-            # Save as new memory with metadata
+            # Pure append: only the new content is written. Rewriting the whole context
+            # each time made every append O(existing size) and stored overlapping copies;
+            # get_all_memories_context already merges the user's memories at read time.
             metadata = {
                 'collection': 'brand_context',
                 'content_type': content_type,
-                'is_unified': True
+                'is_unified': True,
+                'timestamp': datetime.now().isoformat()
             }
             
-            result = await self.mem0_service.add_memory(user_id, unified_content, metadata)
+            result = await self.mem0_service.add_memory(user_id, new_content, metadata)
             
             if result:
-                print(f"[Memory] OK Appended to unified brand context: {result.get('resource_id')}")
+                logger.info("[Memory] OK Appended to unified brand context: %s", result.get('resource_id'))
             
             return result
             
         except Exception as e:
-            print(f"[Memory] ERROR: Error appending to unified brand context: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[Memory] ERROR: Error appending to unified brand context: %s", e)
             return None
     
     async def get_context_summary(self, user_id: str, query: str) -> str:
@@ -230,7 +253,7 @@ class MemoryService:
             answer = results['answer']
             # Ensure we have meaningful content
             if len(answer.strip()) > 20:
-                print(f"[Memory] OK Retrieved context for query '{query[:50]}...' ({len(answer)} chars)")
+                logger.info("[Memory] OK Retrieved context for query %.50r (%d chars)", query, len(answer))
                 return answer
         return ""
 
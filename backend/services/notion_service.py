@@ -3,15 +3,42 @@ Notion Service - Integration with Notion API
 Allows users to import pages and databases from Notion as brand context
 """
 
+import copy
 import os
+import http.cookiejar
+import importlib.util
 import httpx
 from typing import Dict, Optional, List
 import asyncio
 
+from utils.ttl_cache import TTLCache, hash_token
+
+NOTION_VERSION = "2022-06-28"
+
+# Markdown prefix for each supported text block type (to_do is handled separately,
+# since its prefix depends on the checkbox state)
+_BLOCK_PREFIX = {
+    "paragraph": "",
+    "heading_1": "# ",
+    "heading_2": "## ",
+    "heading_3": "### ",
+    "bulleted_list_item": "- ",
+    "numbered_list_item": "1. ",
+    "quote": "> ",
+}
+
 
 class NotionService:
     """Service for interacting with Notion API"""
     
+    # Notion allows an average of 3 requests per second per integration. Batch fetches
+    # start at most REQUESTS_PER_SECOND requests per second, with at most
+    # MAX_CONCURRENT_REQUESTS of them in flight
+    REQUESTS_PER_SECOND = 3
+    MAX_CONCURRENT_REQUESTS = 3
+    # Search results go stale faster than page contents as pages are created or shared
+    SEARCH_CACHE_TTL = 60
+    
     def __init__(self):
         self.api_base_url = "https://api.notion.com/v1"
         # Support both OAuth and internal integration token
@@ -21,6 +48,14 @@ class NotionService:
         # Use backend URL for callback (OAuth callback goes to backend, then redirects to frontend)
         backend_url = os.getenv("BACKEND_URL", "http://localhost:8000")
         self.redirect_uri = os.getenv("NOTION_REDIRECT_URI", f"{backend_url}/api/integrations/notion/callback")
+        # Shared connection pool for all Notion API calls, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        # Event loop time before which the next paced request may not start
+        self._next_request_at = 0.0
+        # User info, search results and page contents per access token; pages are
+        # fetched repeatedly while a user browses and imports them. Cached dicts and
+        # lists are handed out as copies so callers cannot modify the cached ones
+        self._cache = TTLCache(maxsize=1024, ttl=300)
         
         if self.internal_token:
             print("[Notion] Service initialized with internal integration token")
@@ -29,6 +64,27 @@ class NotionService:
         else:
             print("[Notion] WARNING: Notion not configured. Set NOTION_SECRET (for internal integration) or NOTION_CLIENT_ID and NOTION_CLIENT_SECRET (for OAuth)")
     
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared keep-alive HTTP client, creating it lazily"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={"Notion-Version": NOTION_VERSION},
+                # The client is shared by every user's requests, so cookies set by one
+                # response must never be sent on another user's request
+                cookies=http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+                # HTTP/2 needs the optional h2 package
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                timeout=30.0
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     def get_token(self, user_token: Optional[str] = None) -> Optional[str]:
         """Get Notion API token - prefer user token, then internal token, then None"""
         if user_token:
@@ -54,138 +110,168 @@ class NotionService:
     async def exchange_code_for_token(self, code: str) -> Optional[Dict]:
         """Exchange authorization code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.notion.com/v1/oauth/token",
-                    auth=(self.client_id, self.client_secret),
-                    data={
-                        "grant_type": "authorization_code",
-                        "code": code,
-                        "redirect_uri": self.redirect_uri
-                    }
-                )
-                response.raise_for_status()
-                return response.json()
+            client = await self._get_client()
+            response = await client.post(
+                "https://api.notion.com/v1/oauth/token",
+                auth=(self.client_id, self.client_secret),
+                data={
+                    "grant_type": "authorization_code",
+                    "code": code,
+                    "redirect_uri": self.redirect_uri
+                }
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             print(f"[Notion] Error exchanging code: {e}")
             return None
     
     async def get_user_info(self, access_token: str) -> Optional[Dict]:
-        """Get authenticated user information"""
+        """Get authenticated user information (cached per access token)"""
+        cache_key = ("user", hash_token(access_token))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_base_url}/users/me",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Notion-Version": "2022-06-28"
-                    }
-                )
-                response.raise_for_status()
-                return response.json()
+            client = await self._get_client()
+            response = await client.get(
+                f"{self.api_base_url}/users/me",
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            response.raise_for_status()
+            user_info = response.json()
+            self._cache.set(cache_key, copy.deepcopy(user_info))
+            return user_info
         except Exception as e:
             print(f"[Notion] Error getting user info: {e}")
             return None
     
     async def search_pages(self, access_token: Optional[str] = None, query: str = "") -> List[Dict]:
-        """Search for pages in user's Notion workspace"""
+        """Search for pages in user's Notion workspace (cached per token and query for SEARCH_CACHE_TTL)"""
         token = self.get_token(access_token)
         if not token:
             print("[Notion] No token available for search")
             return []
         
+        cache_key = ("search", hash_token(token), query)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_base_url}/search",
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Notion-Version": "2022-06-28",
-                        "Content-Type": "application/json"
+            client = await self._get_client()
+            response = await client.post(
+                f"{self.api_base_url}/search",
+                headers={"Authorization": f"Bearer {token}"},
+                json={
+                    "query": query,
+                    "filter": {
+                        "value": "page",
+                        "property": "object"
                     },
-                    json={
-                        "query": query,
-                        "filter": {
-                            "value": "page",
-                            "property": "object"
-                        },
-                        "page_size": 100
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("results", [])
+                    "page_size": 100
+                }
+            )
+            response.raise_for_status()
+            pages = response.json().get("results", [])
+            self._cache.set(cache_key, copy.deepcopy(pages), ttl=self.SEARCH_CACHE_TTL)
+            return pages
         except Exception as e:
             print(f"[Notion] Error searching pages: {e}")
             return []
     
     async def get_page_content(self, access_token: Optional[str], page_id: str) -> Optional[str]:
-        """Get full content of a Notion page as text"""
+        """Get full content of a Notion page as text (cached per token and page)"""
         token = self.get_token(access_token)
         if not token:
             print("[Notion] No token available for page content")
             return None
         
+        cache_key = self._page_cache_key(token, page_id)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            async with httpx.AsyncClient() as client:
-                # Get page blocks
-                response = await client.get(
-                    f"{self.api_base_url}/blocks/{page_id}/children",
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Notion-Version": "2022-06-28"
-                    },
-                    params={"page_size": 100}
-                )
-                response.raise_for_status()
-                blocks = response.json().get("results", [])
-                
-                # Extract text from blocks
-                content_parts = []
-                for block in blocks:
-                    block_type = block.get("type", "")
-                    if block_type == "paragraph":
-                        text = self._extract_rich_text(block.get("paragraph", {}).get("rich_text", []))
-                        if text:
-                            content_parts.append(text)
-                    elif block_type == "heading_1":
-                        text = self._extract_rich_text(block.get("heading_1", {}).get("rich_text", []))
-                        if text:
-                            content_parts.append(f"# {text}")
-                    elif block_type == "heading_2":
-                        text = self._extract_rich_text(block.get("heading_2", {}).get("rich_text", []))
-                        if text:
-                            content_parts.append(f"## {text}")
-                    elif block_type == "heading_3":
-                        text = self._extract_rich_text(block.get("heading_3", {}).get("rich_text", []))
-                        if text:
-                            content_parts.append(f"### {text}")
-                    elif block_type == "bulleted_list_item":
-                        text = self._extract_rich_text(block.get("bulleted_list_item", {}).get("rich_text", []))
-                        if text:
-                            content_parts.append(f"- {text}")
-                    elif block_type == "numbered_list_item":
-                        text = self._extract_rich_text(block.get("numbered_list_item", {}).get("rich_text", []))
-                        if text:
-                            content_parts.append(f"1. {text}")
-                    elif block_type == "to_do":
-                        text = self._extract_rich_text(block.get("to_do", {}).get("rich_text", []))
-                        checked = block.get("to_do", {}).get("checked", False)
-                        if text:
-                            content_parts.append(f"{'[x]' if checked else '[ ]'} {text}")
-                    elif block_type == "quote":
-                        text = self._extract_rich_text(block.get("quote", {}).get("rich_text", []))
-                        if text:
-                            content_parts.append(f"> {text}")
-                
-                return "\n\n".join(content_parts) if content_parts else None
+            client = await self._get_client()
+            # Get page blocks
+            response = await client.get(
+                f"{self.api_base_url}/blocks/{page_id}/children",
+                headers={"Authorization": f"Bearer {token}"},
+                params={"page_size": 100}
+            )
+            response.raise_for_status()
+            blocks = response.json().get("results", [])
+            
+            # Extract text from blocks
+            content_parts = []
+            for block in blocks:
+                block_type = block.get("type")
+                data = block.get(block_type) if block_type else None
+                if not data:
+                    continue
+                rich_text = data.get("rich_text")
+                if not rich_text:
+                    continue
+                text = "".join([item.get("plain_text", "") for item in rich_text])
+                if not text:
+                    continue
+                if block_type == "to_do":
+                    content_parts.append(f"{'[x]' if data.get('checked') else '[ ]'} {text}")
+                    continue
+                prefix = _BLOCK_PREFIX.get(block_type)
+                if prefix is not None:
+                    content_parts.append(prefix + text)
+            
+            if not content_parts:
+                return None
+            content = "\n\n".join(content_parts)
+            self._cache.set(cache_key, content)
+            return content
         except Exception as e:
             print(f"[Notion] Error getting page content: {e}")
             return None
     
-    def _extract_rich_text(self, rich_text: List[Dict]) -> str:
-        """Extract plain text from Notion rich text array"""
-        if not rich_text:
-            return ""
-        return "".join([item.get("plain_text", "") for item in rich_text])
-
+    def invalidate(self, page_id: str, access_token: Optional[str] = None):
+        """Drop a page's cached content (e.g. after it was edited in Notion)"""
+        token = self.get_token(access_token)
+        if token:
+            self._cache.pop(self._page_cache_key(token, page_id))
+    
+    def _page_cache_key(self, token: str, page_id: str) -> tuple:
+        """Cache key of a page's content for a token"""
+        return ("page", hash_token(token), page_id)
+    
+    async def _pace(self):
+        """Wait for the next request slot, so paced requests start 1/REQUESTS_PER_SECOND apart"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_request_at)
+        self._next_request_at = start + 1 / self.REQUESTS_PER_SECOND
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def get_pages_content(self, access_token: Optional[str], page_ids: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Fetch several pages' content concurrently
+        
+        Cached pages are returned straight away. Requests for the rest start at most
+        REQUESTS_PER_SECOND per second (shared with any other batch running at the same
+        time) and at most MAX_CONCURRENT_REQUESTS are in flight, keeping to Notion's
+        average rate limit. A page that fails maps to None without affecting the others.
+        """
+        limit = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        token = self.get_token(access_token)
+        
+        async def fetch(page_id: str) -> Optional[str]:
+            if token:
+                cached = self._cache.get(self._page_cache_key(token, page_id))
+                if cached is not None:
+                    return cached
+            async with limit:
+                await self._pace()
+                return await self.get_page_content(access_token, page_id)
+        
+        results = await asyncio.gather(*(fetch(page_id) for page_id in page_ids), return_exceptions=True)
+        return {
+            page_id: None if isinstance(result, BaseException) else result
+            for page_id, result in zip(page_ids, results)
+        }
@@ -1,4 +1,6 @@
 import os
+import http.cookiejar
+import importlib.util
 import httpx
 from typing import Dict, Optional
 from urllib.parse import urlencode, parse_qs, urlparse
@@ -30,6 +32,29 @@ class OAuthService:
         self.tiktok_client_id = os.getenv("TIKTOK_CLIENT_ID", "")
         self.tiktok_client_secret = os.getenv("TIKTOK_CLIENT_SECRET", "")
         self.tiktok_redirect_uri = f"{self.base_url}/api/oauth/tiktok/callback"
+        
+        # Shared connection pool for all token/userinfo calls, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared keep-alive HTTP client, creating it lazily"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                # The client is shared by every user's requests, so cookies set by one
+                # response must never be sent on another user's request
+                cookies=http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+                # HTTP/2 needs the optional h2 package
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=100),
+                timeout=httpx.Timeout(10.0, connect=5.0)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     def get_instagram_auth_url(self, state: str) -> str:
         """Get Instagram OAuth authorization URL (Facebook Graph API)"""
@@ -48,50 +73,50 @@ class OAuthService:
     async def exchange_instagram_code(self, code: str) -> Optional[Dict]:
         """Exchange Instagram authorization code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                # Exchange code for short-lived token
-                response = await client.post(
-                    "https://api.instagram.com/oauth/access_token",
-                    data={
-                        "client_id": self.instagram_client_id,
-                        "client_secret": self.instagram_client_secret,
-                        "grant_type": "authorization_code",
-                        "redirect_uri": self.instagram_redirect_uri,
-                        "code": code
-                    }
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                
-                # Exchange for long-lived token (60 days)
-                long_token_response = await client.get(
-                    "https://graph.instagram.com/access_token",
-                    params={
-                        "grant_type": "ig_exchange_token",
-                        "client_secret": self.instagram_client_secret,
-                        "access_token": token_data["access_token"]
-                    }
-                )
-                long_token_response.raise_for_status()
-                long_token_data = long_token_response.json()
-                
-                # Get user info
-                user_response = await client.get(
-                    "https://graph.instagram.com/me",
-                    params={
-                        "fields": "id,username",
-                        "access_token": long_token_data["access_token"]
-                    }
-                )
-                user_response.raise_for_status()
-                user_data = user_response.json()
-                
-                return {
-                    "access_token": long_token_data["access_token"],
-                    "expires_in": long_token_data.get("expires_in", 5184000),  # 60 days
-                    "user_id": user_data["id"],
-                    "username": user_data.get("username", "")
+            client = await self._get_client()
+            # Exchange code for short-lived token
+            response = await client.post(
+                "https://api.instagram.com/oauth/access_token",
+                data={
+                    "client_id": self.instagram_client_id,
+                    "client_secret": self.instagram_client_secret,
+                    "grant_type": "authorization_code",
+                    "redirect_uri": self.instagram_redirect_uri,
+                    "code": code
+                }
+            )
+            response.raise_for_status()
+            token_data = response.json()
+            
+            # Exchange for long-lived token (60 days)
+            long_token_response = await client.get(
+                "https://graph.instagram.com/access_token",
+                params={
+                    "grant_type": "ig_exchange_token",
+                    "client_secret": self.instagram_client_secret,
+                    "access_token": token_data["access_token"]
                 }
+            )
+            long_token_response.raise_for_status()
+            long_token_data = long_token_response.json()
+            
+            # Get user info
+            user_response = await client.get(
+                "https://graph.instagram.com/me",
+                params={
+                    "fields": "id,username",
+                    "access_token": long_token_data["access_token"]
+                }
+            )
+            user_response.raise_for_status()
+            user_data = user_response.json()
+            
+            return {
+                "access_token": long_token_data["access_token"],
+                "expires_in": long_token_data.get("expires_in", 5184000),  # 60 days
+                "user_id": user_data["id"],
+                "username": user_data.get("username", "")
+            }
         except Exception as e:
             print(f"[OAuth] Instagram token exchange failed: {e}")
             return None
@@ -115,36 +140,36 @@ class OAuthService:
     async def exchange_linkedin_code(self, code: str) -> Optional[Dict]:
         """Exchange LinkedIn authorization code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://www.linkedin.com/oauth/v2/accessToken",
-                    data={
-                        "grant_type": "authorization_code",
-                        "code": code,
-                        "redirect_uri": self.linkedin_redirect_uri,
-                        "client_id": self.linkedin_client_id,
-                        "client_secret": self.linkedin_client_secret
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                
-                # Get user info
-                user_response = await client.get(
-                    "https://api.linkedin.com/v2/userinfo",
-                    headers={"Authorization": f"Bearer {token_data['access_token']}"}
-                )
-                user_response.raise_for_status()
-                user_data = user_response.json()
-                
-                return {
-                    "access_token": token_data["access_token"],
-                    "expires_in": token_data.get("expires_in", 5184000),
-                    "refresh_token": token_data.get("refresh_token"),
-                    "user_id": user_data.get("sub", ""),
-                    "username": user_data.get("name", "")
-                }
+            client = await self._get_client()
+            response = await client.post(
+                "https://www.linkedin.com/oauth/v2/accessToken",
+                data={
+                    "grant_type": "authorization_code",
+                    "code": code,
+                    "redirect_uri": self.linkedin_redirect_uri,
+                    "client_id": self.linkedin_client_id,
+                    "client_secret": self.linkedin_client_secret
+                },
+                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            )
+            response.raise_for_status()
+            token_data = response.json()
+            
+            # Get user info
+            user_response = await client.get(
+                "https://api.linkedin.com/v2/userinfo",
+                headers={"Authorization": f"Bearer {token_data['access_token']}"}
+            )
+            user_response.raise_for_status()
+            user_data = user_response.json()
+            
+            return {
+                "access_token": token_data["access_token"],
+                "expires_in": token_data.get("expires_in", 5184000),
+                "refresh_token": token_data.get("refresh_token"),
+                "user_id": user_data.get("sub", ""),
+                "username": user_data.get("name", "")
+            }
         except Exception as e:
             print(f"[OAuth] LinkedIn token exchange failed: {e}")
             return None
@@ -165,36 +190,36 @@ class OAuthService:
     async def exchange_x_code(self, code: str) -> Optional[Dict]:
         """Exchange X authorization code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.twitter.com/2/oauth2/token",
-                    data={
-                        "code": code,
-                        "grant_type": "authorization_code",
-                        "client_id": self.x_client_id,
-                        "redirect_uri": self.x_redirect_uri,
-                        "code_verifier": "challenge"  # In production, use PKCE
-                    },
-                    auth=(self.x_client_id, self.x_client_secret)
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                
-                # Get user info
-                user_response = await client.get(
-                    "https://api.twitter.com/2/users/me",
-                    headers={"Authorization": f"Bearer {token_data['access_token']}"}
-                )
-                user_response.raise_for_status()
-                user_data = user_response.json()["data"]
-                
-                return {
-                    "access_token": token_data["access_token"],
-                    "expires_in": token_data.get("expires_in", 7200),
-                    "refresh_token": token_data.get("refresh_token"),
-                    "user_id": user_data["id"],
-                    "username": user_data.get("username", "")
-                }
+            client = await self._get_client()
+            response = await client.post(
+                "https://api.twitter.com/2/oauth2/token",
+                data={
+                    "code": code,
+                    "grant_type": "authorization_code",
+                    "client_id": self.x_client_id,
+                    "redirect_uri": self.x_redirect_uri,
+                    "code_verifier": "challenge"  # In production, use PKCE
+                },
+                auth=(self.x_client_id, self.x_client_secret)
+            )
+            response.raise_for_status()
+            token_data = response.json()
+            
+            # Get user info
+            user_response = await client.get(
+                "https://api.twitter.com/2/users/me",
+                headers={"Authorization": f"Bearer {token_data['access_token']}"}
+            )
+            user_response.raise_for_status()
+            user_data = user_response.json()["data"]
+            
+            return {
+                "access_token": token_data["access_token"],
+                "expires_in": token_data.get("expires_in", 7200),
+                "refresh_token": token_data.get("refresh_token"),
+                "user_id": user_data["id"],
+                "username": user_data.get("username", "")
+            }
         except Exception as e:
             print(f"[OAuth] X token exchange failed: {e}")
             return None
@@ -213,36 +238,36 @@ class OAuthService:
     async def exchange_tiktok_code(self, code: str) -> Optional[Dict]:
         """Exchange TikTok authorization code for access token"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://open.tiktokapis.com/v2/oauth/token/",
-                    data={
-                        "client_key": self.tiktok_client_id,
-                        "client_secret": self.tiktok_client_secret,
-                        "code": code,
-                        "grant_type": "authorization_code",
-                        "redirect_uri": self.tiktok_redirect_uri
-                    }
-                )
-                response.raise_for_status()
-                token_data = response.json()["data"]
-                
-                # Get user info
-                user_response = await client.get(
-                    "https://open.tiktokapis.com/v2/user/info/",
-                    headers={"Authorization": f"Bearer {token_data['access_token']}"},
-                    params={"fields": "open_id,union_id,avatar_url,display_name"}
-                )
-                user_response.raise_for_status()
-                user_data = user_response.json()["data"]["user"]
-                
-                return {
-                    "access_token": token_data["access_token"],
-                    "expires_in": token_data.get("expires_in", 7200),
-                    "refresh_token": token_data.get("refresh_token"),
-                    "user_id": user_data.get("open_id", ""),
-                    "username": user_data.get("display_name", "")
+            client = await self._get_client()
+            response = await client.post(
+                "https://open.tiktokapis.com/v2/oauth/token/",
+                data={
+                    "client_key": self.tiktok_client_id,
+                    "client_secret": self.tiktok_client_secret,
+                    "code": code,
+                    "grant_type": "authorization_code",
+                    "redirect_uri": self.tiktok_redirect_uri
                 }
+            )
+            response.raise_for_status()
+            token_data = response.json()["data"]
+            
+            # Get user info
+            user_response = await client.get(
+                "https://open.tiktokapis.com/v2/user/info/",
+                headers={"Authorization": f"Bearer {token_data['access_token']}"},
+                params={"fields": "open_id,union_id,avatar_url,display_name"}
+            )
+            user_response.raise_for_status()
+            user_data = user_response.json()["data"]["user"]
+            
+            return {
+                "access_token": token_data["access_token"],
+                "expires_in": token_data.get("expires_in", 7200),
+                "refresh_token": token_data.get("refresh_token"),
+                "user_id": user_data.get("open_id", ""),
+                "username": user_data.get("display_name", "")
+            }
         except Exception as e:
             print(f"[OAuth] TikTok token exchange failed: {e}")
             return None
@@ -4,6 +4,7 @@ Replaces Hyperspell document storage functionality
 """
 
 import os
+import threading
 import boto3
 from typing import Optional, Dict
 from datetime import datetime
@@ -259,3 +260,17 @@ class S3Service:
         
         return f"{folder}/{safe_user_id}/{timestamp}_{safe_filename}"
 
+
+# One S3Service per process, so the client (and its bucket check) is created once
+_service: Optional[S3Service] = None
+_service_lock = threading.Lock()
+
+
+def get_s3_service() -> S3Service:
+    """Return the process-wide S3Service, creating it on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = S3Service()
+    return _service